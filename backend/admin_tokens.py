@@ -0,0 +1,50 @@
+import secrets
+import threading
+import time
+
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class AdminTokenManager:
+    """Issue and verify HMAC-signed, expiring admin tokens without a database.
+
+    Each token carries the admin's user id and a random token id. Logged-out
+    token ids are kept in an in-memory denylist until the token would have
+    expired anyway.
+    """
+
+    def __init__(self, secret_key=None, max_age=8 * 60 * 60):
+        self.max_age = max_age
+        self._serializer = URLSafeTimedSerializer(secret_key, salt='admin-token') if secret_key else None
+        self._denylist = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_age = app.config['ADMIN_TOKEN_MAX_AGE']
+        self._serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='admin-token')
+
+    def issue(self, user_id):
+        return self._serializer.dumps({'uid': user_id, 'jti': secrets.token_urlsafe(8)})
+
+    def verify(self, token):
+        """Return the token payload, raising InvalidToken if it is forged, expired or revoked."""
+        try:
+            payload = self._serializer.loads(token, max_age=self.max_age)
+        except SignatureExpired:
+            raise InvalidToken('Token expired')
+        except BadSignature:
+            raise InvalidToken('Bad token signature')
+        if payload.get('jti') in self._denylist:
+            raise InvalidToken('Token revoked')
+        return payload
+
+    def revoke(self, payload):
+        now = time.time()
+        with self._lock:
+            # Forget revocations whose tokens have expired by now
+            self._denylist = {jti: expires for jti, expires in self._denylist.items() if expires > now}
+            self._denylist[payload['jti']] = now + self.max_age
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+
+def hour_segments(start_time, end_time):
+    """Split a booking into (day, hour, seconds) pieces, one per clock hour it covers."""
+    cursor = start_time
+    while cursor < end_time:
+        next_hour = cursor.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        segment_end = min(next_hour, end_time)
+        yield cursor.date(), cursor.hour, int((segment_end - cursor).total_seconds())
+        cursor = segment_end
+
+
+class RollupAccumulator:
+    """Sum booking and complaint deltas per rollup key before they are written.
+
+    Booked seconds go to the slot's day and to every hour a booking covers;
+    the booking itself is counted once, where it starts. ``sign`` is -1 for
+    cancellations.
+    """
+
+    def __init__(self):
+        self.slot_days = {}
+        self.hours = {}
+        self.complaints = {}
+
+    @staticmethod
+    def _add(totals, key, seconds, count):
+        booked_seconds, bookings = totals.get(key, (0, 0))
+        totals[key] = (booked_seconds + seconds, bookings + count)
+
+    def add_booking(self, slot_id, start_time, end_time, vehicle_type, sign=1):
+        first = True
+        for day, hour, seconds in hour_segments(start_time, end_time):
+            count = sign if first else 0
+            self._add(self.slot_days, (day, slot_id), sign * seconds, count)
+            self._add(self.hours, (day, hour, vehicle_type), sign * seconds, count)
+            first = False
+
+    def add_complaint(self, slot_name, created_at, sign=1):
+        key = (created_at.date(), slot_name)
+        self.complaints[key] = self.complaints.get(key, 0) + sign
+
+    def slot_day_rows(self):
+        return [{'day': day, 'slot_id': slot_id, 'booked_seconds': booked_seconds, 'bookings': bookings}
+                for (day, slot_id), (booked_seconds, bookings) in self.slot_days.items()]
+
+    def hourly_rows(self):
+        return [{
+            'day': day,
+            'hour': hour,
+            'vehicle_type': vehicle_type,
+            'weekday': day.weekday(),
+            'booked_seconds': booked_seconds,
+            'bookings': bookings,
+        } for (day, hour, vehicle_type), (booked_seconds, bookings) in self.hours.items()]
+
+    def complaint_rows(self):
+        return [{'day': day, 'slot_name': slot_name, 'complaints': count}
+                for (day, slot_name), count in self.complaints.items()]
+
+
+def count_weekdays(first_day, last_day):
+    """Return how many times each weekday (Monday = 0) occurs in the inclusive range."""
+    days = (last_day - first_day).days + 1
+    counts = [days // 7] * 7
+    for offset in range(days % 7):
+        counts[(first_day.weekday() + offset) % 7] += 1
+    return counts
+
+
+def ratio(value, capacity):
+    return round(value / capacity, 4) if capacity else 0.0
+
+
+def parse_day(value, default):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else default
@@ -0,0 +1,154 @@
+import hashlib
+import threading
+from datetime import datetime, time, timedelta
+from itertools import groupby
+from time import monotonic
+
+# Operating hours and booking horizon of the first lot, which took over the
+# original single-lot rules
+OPENING_HOUR = 8
+CLOSING_HOUR = 22
+BOOKING_HORIZON_DAYS = 1
+
+
+def day_windows(days, opening_hour, closing_hour, labels=None):
+    """Return the (label, start, end) operating windows of a lot for each date in ``days``.
+
+    Labels default to ISO dates.
+    """
+    labels = labels or [day.isoformat() for day in days]
+    # Hours are added to midnight so a lot closing at 24 ends at the next midnight
+    midnights = [datetime.combine(day, time.min) for day in days]
+    return [
+        (label, midnight + timedelta(hours=opening_hour), midnight + timedelta(hours=closing_hour))
+        for label, midnight in zip(labels, midnights)
+    ]
+
+
+def date_range(first_day, last_day):
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+
+def day_label(day, today):
+    # The dashboard's two-day view keys availability by these names
+    if day == today:
+        return 'today'
+    if day == today + timedelta(days=1):
+        return 'tomorrow'
+    return day.isoformat()
+
+
+def free_intervals(window_start, window_end, bookings):
+    """Sweep bookings sorted by start time and return the free (start, end) gaps.
+
+    Bookings are (start_time, end_time) pairs of native datetimes; anything
+    outside the window is clipped, so callers may pass a superset.
+    """
+    free = []
+    cursor = window_start
+    for start, end in bookings:
+        if end <= cursor or start >= window_end:
+            continue
+        if start > cursor:
+            free.append((cursor, start))
+        if end > cursor:
+            cursor = end
+        if cursor >= window_end:
+            break
+    if cursor < window_end:
+        free.append((cursor, window_end))
+    return free
+
+
+def serialize_intervals(intervals):
+    return [{'start': start.isoformat(), 'end': end.isoformat()} for start, end in intervals]
+
+
+def slot_availability(windows, bookings):
+    """Build the per-day availability dict for one slot from its sorted bookings."""
+    return {
+        day: serialize_intervals(free_intervals(start, end, bookings))
+        for day, start, end in windows
+    }
+
+
+def compute_availability(slots, booking_rows, windows):
+    """Compute availability for every slot in one pass.
+
+    ``slots`` is an iterable of (id, name) rows and ``booking_rows`` an iterable
+    of (slot_id, start_time, end_time) rows ordered by slot_id, start_time.
+    """
+    bookings_by_slot = {
+        slot_id: [(start, end) for _, start, end in rows]
+        for slot_id, rows in groupby(booking_rows, key=lambda row: row[0])
+    }
+    return [{
+        'id': slot_id,
+        'name': name,
+        'availability': slot_availability(windows, bookings_by_slot.get(slot_id, ()))
+    } for slot_id, name in slots]
+
+
+class AvailabilityCache:
+    """Per-process availability cache keyed by (slot_id, date).
+
+    Each entry records the ParkingSlot.version it was computed at and the
+    stamp of its lot's bookings that day (see ``booking_stamps`` in app.py).
+    Every booking and cancellation bumps the version, in whichever worker
+    made it, and bookings inserted or deleted outside the application change
+    the stamp, so an entry is only served while both still match the
+    database. Entries also expire after ``ttl`` seconds, which bounds how
+    long other edits made outside the application stay invisible.
+    """
+
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._first_day = None
+
+    def purge_before(self, today):
+        """Drop entries for past days once the date changes."""
+        with self._lock:
+            if today != self._first_day:
+                self._entries = {key: value for key, value in self._entries.items() if key[1] >= today}
+                self._first_day = today
+
+    def get_many(self, slot_versions, windows, day_stamps):
+        """Return {slot_id: availability} for slots whose days are all cached at their current version and stamp."""
+        found = {}
+        now = monotonic()
+        with self._lock:
+            for slot_id, version in slot_versions.items():
+                days = {}
+                for day, start, _ in windows:
+                    entry = self._entries.get((slot_id, start.date()))
+                    if (entry is None or entry[0] != version or entry[1] != day_stamps[start.date()]
+                            or entry[2] <= now):
+                        break
+                    days[day] = entry[3]
+                else:
+                    found[slot_id] = days
+        return found
+
+    def store_many(self, slot_versions, windows, day_stamps, slot_info):
+        expires_at = monotonic() + self.ttl
+        with self._lock:
+            for info in slot_info:
+                for day, start, _ in windows:
+                    self._entries[(info['id'], start.date())] = (
+                        slot_versions[info['id']], day_stamps[start.date()], expires_at, info['availability'][day])
+
+    def invalidate(self, slot_id, day):
+        """Drop one slot's entry for a date after a booking write on it."""
+        with self._lock:
+            self._entries.pop((slot_id, day), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def listing_etag(*parts):
+    """A strong ETag from everything the listing depends on; equal across workers."""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
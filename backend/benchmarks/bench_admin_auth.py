@@ -0,0 +1,70 @@
+"""Compare admin-endpoint latency with signed tokens against a per-request admin lookup.
+
+The legacy check is re-registered on a benchmark-only route so both paths
+serve the same handler through the Flask test client.
+
+Usage: python benchmarks/bench_admin_auth.py [--requests N]
+"""
+import argparse
+import statistics
+import time
+from functools import wraps
+
+from werkzeug.security import generate_password_hash
+
+from common import load_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    app_module, app = load_app()
+    db, User = app_module.db, app_module.User
+    jsonify = app_module.jsonify
+
+    def legacy_admin_required(f):
+        @wraps(f)
+        def decorated_function(*a, **kw):
+            if not app_module.request.headers.get('Authorization'):
+                return jsonify({'message': 'No token provided'}), 401
+            if not User.query.filter_by(is_admin=True).first():
+                return jsonify({'message': 'Invalid token'}), 403
+            return f(*a, **kw)
+        return decorated_function
+
+    def ping():
+        return jsonify({'ok': True})
+
+    app.add_url_rule('/bench/signed', 'bench_signed', app_module.admin_required(ping))
+    app.add_url_rule('/bench/legacy', 'bench_legacy', legacy_admin_required(ping))
+
+    with app.app_context():
+        db.session.add(User(name='Admin', username='admin', email='admin@example.com',
+                            password=generate_password_hash('admin123'), is_admin=True))
+        db.session.commit()
+
+    client = app.test_client()
+    token = client.post('/api/admin/login', json={'username': 'admin', 'password': 'admin123'}).get_json()['token']
+    headers = {'Authorization': token}
+
+    results = {}
+    for name, path in (('database lookup', '/bench/legacy'), ('signed token', '/bench/signed')):
+        latencies = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            response = client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+        latencies.sort()
+        results[name] = latencies
+        print(f"{name:16} p50={statistics.median(latencies) * 1e6:.0f} us "
+              f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1e6:.0f} us")
+
+    client.post('/api/admin/logout', headers=headers)
+    assert client.get('/bench/signed', headers=headers).status_code == 403, 'revoked token still accepted'
+
+
+if __name__ == '__main__':
+    main()
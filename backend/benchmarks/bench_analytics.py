@@ -0,0 +1,124 @@
+"""Benchmark /api/admin/analytics over a year of history and check the rollups.
+
+Seeds a year of bookings (older ones moved to the archive by the retention
+job), rebuilds the rollups, then times the analytics endpoint against
+aggregating the raw booking rows in Python. Finally books, bulk books,
+cancels and complains through the API and checks that the incrementally
+maintained rollups match a fresh rebuild.
+
+Usage: python benchmarks/bench_analytics.py [--slots S] [--days D] [--per-day N]
+"""
+import argparse
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from common import Checks, load_app, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--slots', type=int, default=50)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--per-day', type=int, default=6, help='bookings per slot per day')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    app_module, app = load_app({'LOG_LEVEL': 'OFF', 'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1'})
+    db = app_module.db
+    rng = random.Random(args.seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    with app.app_context():
+        app_module.create_admin_user()
+        db.session.bulk_insert_mappings(app_module.ParkingSlot, [{'name': f'S{i}'} for i in range(1, args.slots + 1)])
+        bookings = []
+        for day in range(1, args.days + 1):
+            for slot_id in range(1, args.slots + 1):
+                # Non-overlapping bookings at random points of the 8:00-22:00 day
+                starts = sorted(rng.sample(range(8 * 4, 21 * 4), args.per_day))
+                for start, following in zip(starts, starts[1:] + [22 * 4]):
+                    begin = today - timedelta(days=day) + timedelta(minutes=15 * start)
+                    length = min(rng.randint(1, 8), following - start)
+                    bookings.append({'user_id': 1, 'slot_id': slot_id, 'start_time': begin,
+                                     'end_time': begin + timedelta(minutes=15 * length),
+                                     'vehicle_type': rng.choice(('car', 'car', 'bike'))})
+        db.session.bulk_insert_mappings(app_module.Booking, bookings)
+        db.session.bulk_insert_mappings(app_module.Complaint, [{
+            'user_id': 1, 'slot_name': f'S{rng.randint(1, args.slots)}', 'description': 'Seeded',
+            'created_at': today - timedelta(minutes=rng.randint(60, args.days * 24 * 60)),
+        } for _ in range(5000)])
+        db.session.commit()
+        archived = app_module.run_retention(90, 5000)['bookings_archived']
+        stats = app_module.rebuild_rollups(5000)
+    print(f"{len(bookings)} bookings ({archived} archived): rebuilt {stats['rollup_rows']} rollup rows "
+          f"in {stats['seconds']}s ({stats['rows_per_second']} rows/s)")
+
+    check = Checks()
+
+    client = app.test_client()
+    token = client.post('/api/admin/login', json={'username': 'admin', 'password': 'admin123'}).get_json()['token']
+    first_day = (today - timedelta(days=args.days)).date()
+    last_day = today.date()
+    url = f'/api/admin/analytics?from={first_day}&to={last_day}'
+    rollup_seconds, response = timed(lambda: client.get(url, headers={'Authorization': token}), repeat=5)
+    report = response.get_json()
+
+    def from_raw_rows():
+        # What the dashboard had to do before: fetch every booking and aggregate row by row
+        per_slot = defaultdict(lambda: [0, 0])
+        with app.app_context():
+            for model in (app_module.Booking, app_module.BookingArchive):
+                for slot_id, start, end in db.session.query(model.slot_id, model.start_time, model.end_time).filter(
+                        model.start_time >= datetime.combine(first_day, datetime.min.time())):
+                    per_slot[slot_id][0] += 1
+                    per_slot[slot_id][1] += (end - start).total_seconds()
+        return per_slot
+
+    raw_seconds, per_slot = timed(from_raw_rows, repeat=1)
+    print(f"analytics over {args.days} days: {rollup_seconds * 1e3:.1f} ms from rollups, "
+          f"{raw_seconds * 1e3:.1f} ms aggregating raw rows ({raw_seconds / rollup_seconds:.0f}x)")
+
+    check('analytics responds 200', response.status_code == 200)
+    check('per-slot booking counts match the raw rows',
+          all(slot['bookings'] == per_slot[slot['slot_id']][0] for slot in report['slots']))
+    check('per-slot booked hours match the raw rows',
+          all(abs(slot['booked_hours'] - per_slot[slot['slot_id']][1] / 3600) < 0.01 for slot in report['slots']))
+    check('complaints are counted per slot name', sum(row['complaints'] for row in report['complaints']) == 5000)
+    check('heatmap covers every weekday and operating hour',
+          len(report['heatmap']) == 7 and all(len(row) == len(report['hours']) for row in report['heatmap']))
+
+    # Incremental maintenance must agree with a rebuild
+    tomorrow = today + timedelta(days=1)
+    single = client.post('/api/book', json={'user_id': 1, 'slot_id': 1, 'vehicle_type': 'car',
+                                            'start_time': tomorrow.replace(hour=9, minute=30).isoformat(),
+                                            'end_time': tomorrow.replace(hour=11, minute=15).isoformat()})
+    client.post('/api/book/bulk', json={'user_id': 1, 'items': [
+        {'slot_id': slot_id, 'vehicle_type': 'bike', 'start_time': tomorrow.replace(hour=12).isoformat(),
+         'end_time': tomorrow.replace(hour=13, minute=45).isoformat()} for slot_id in range(1, 6)]})
+    client.post('/api/book', json={'user_id': 1, 'slot_id': 2, 'vehicle_type': 'car',
+                                   'start_time': tomorrow.replace(hour=15).isoformat(),
+                                   'end_time': tomorrow.replace(hour=16).isoformat()})
+    client.post('/api/cancel-booking', json={'booking_id': single.get_json()['booking_id']})
+    client.post('/api/complaint', json={'user_id': 1, 'slot_name': 'S3', 'description': 'Blocked'})
+
+    def snapshot():
+        with app.app_context():
+            rollups = []
+            for model, key in ((app_module.SlotDayRollup, ('day', 'slot_id')),
+                               (app_module.HourlyRollup, ('day', 'hour', 'vehicle_type'))):
+                columns = [getattr(model, name) for name in key + ('booked_seconds', 'bookings')]
+                rollups.append({row[:len(key)]: row[len(key):] for row in db.session.query(*columns) if any(row[len(key):])})
+            complaints = dict(((day, name), count) for day, name, count in db.session.query(
+                app_module.ComplaintRollup.day, app_module.ComplaintRollup.slot_name, app_module.ComplaintRollup.complaints))
+            return rollups, complaints
+
+    incremental = snapshot()
+    with app.app_context():
+        app_module.rebuild_rollups(5000)
+    check('incremental rollups match a rebuild', incremental == snapshot())
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
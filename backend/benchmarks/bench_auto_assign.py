@@ -0,0 +1,85 @@
+"""Time best-fit slot selection from the in-memory interval index.
+
+Compares SlotIntervalIndex.best_fit against probing the database slot by
+slot for the first free one, on a day seeded with random bookings, and
+checks that "any slot" bookings through /api/book never double-book.
+
+Usage: python benchmarks/bench_auto_assign.py [--slots N] [--bookings M] [--queries Q]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from common import load_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--slots', type=int, default=3000)
+    parser.add_argument('--bookings', type=int, default=15000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    app_module, app = load_app()
+    db, Booking, ParkingSlot = app_module.db, app_module.Booking, app_module.ParkingSlot
+    rng = random.Random(args.seed)
+    day = (datetime.now() + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
+
+    # Non-overlapping bookings: each slot's day is cut into half-hour cells
+    cells = rng.sample(range(args.slots * 28), min(args.bookings, args.slots * 28))
+    with app.app_context():
+        db.session.add(app_module.User(name='Bench', username='bench', email='bench@example.com', password='x'))
+        db.session.bulk_insert_mappings(ParkingSlot, [{'name': f'S{i}'} for i in range(args.slots)])
+        db.session.bulk_insert_mappings(Booking, [{
+            'user_id': 1, 'slot_id': cell // 28 + 1,
+            'start_time': day + timedelta(minutes=30 * (cell % 28)),
+            'end_time': day + timedelta(minutes=30 * (cell % 28 + 1)),
+            'vehicle_type': 'car'
+        } for cell in cells])
+        db.session.commit()
+
+    windows = []
+    for _ in range(args.queries):
+        start = day + timedelta(minutes=30 * rng.randrange(0, 26))
+        windows.append((start, start + timedelta(minutes=30 * rng.randint(1, 2))))
+
+    with app.app_context():
+        index = app_module.slot_index
+        index.best_fit(app_module.DEFAULT_LOT_ID, *windows[0], app_module.load_slot_day)  # load the day once
+
+        started = time.perf_counter()
+        for start, end in windows:
+            index.best_fit(app_module.DEFAULT_LOT_ID, start, end, app_module.load_slot_day)
+        index_time = (time.perf_counter() - started) / args.queries
+
+        started = time.perf_counter()
+        for start, end in windows:
+            for (slot_id,) in db.session.query(ParkingSlot.id).order_by(ParkingSlot.id):
+                if not db.session.query(Booking.id).filter(Booking.slot_id == slot_id, Booking.start_time < end,
+                                                           Booking.end_time > start).first():
+                    break
+        probe_time = (time.perf_counter() - started) / args.queries
+
+    print(f"slots={args.slots} bookings={len(cells)}")
+    print(f"interval index best fit: {index_time * 1000:8.3f} ms/query")
+    print(f"database probing:        {probe_time * 1000:8.3f} ms/query")
+
+    client = app.test_client()
+    start, end = windows[0]
+    made = 0
+    for _ in range(20):
+        response = client.post('/api/book', json={'user_id': 1, 'slot_id': 'any', 'vehicle_type': 'car',
+                                                  'start_time': start.isoformat(), 'end_time': end.isoformat()})
+        made += response.status_code == 201
+    with app.app_context():
+        rows = db.session.query(Booking.slot_id, Booking.start_time, Booking.end_time).order_by(
+            Booking.slot_id, Booking.start_time).all()
+    overlaps = sum(1 for a, b in zip(rows, rows[1:]) if a.slot_id == b.slot_id and b.start_time < a.end_time)
+    print(f"auto-assigned bookings: {made}, overlaps: {overlaps}")
+    assert overlaps == 0
+
+
+if __name__ == '__main__':
+    main()
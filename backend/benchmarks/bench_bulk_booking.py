@@ -0,0 +1,82 @@
+"""Compare one bulk booking request against the same bookings made one call at a time.
+
+Usage: python benchmarks/bench_bulk_booking.py [--items N] [--slots S]
+"""
+import argparse
+import time
+
+import sqlalchemy as sa
+from datetime import datetime, timedelta
+
+from common import load_app
+
+
+def make_items(slot_ids, count, day):
+    # Distinct half-hour windows spread over the slots, so nothing conflicts
+    per_slot = 28
+    items = []
+    for i in range(count):
+        slot_id = slot_ids[i // per_slot]
+        start = day + timedelta(minutes=30 * (i % per_slot))
+        items.append({'slot_id': slot_id, 'start_time': start.isoformat(),
+                      'end_time': (start + timedelta(minutes=30)).isoformat(), 'vehicle_type': 'car'})
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=200)
+    args = parser.parse_args()
+
+    app_module, app = load_app()
+    db = app_module.db
+    slot_count = 2 * (args.items // 28 + 1)
+    with app.app_context():
+        db.session.add(app_module.User(name='Fleet', username='fleet', email='fleet@example.com', password='x'))
+        db.session.bulk_insert_mappings(app_module.ParkingSlot, [{'name': f'F{i}'} for i in range(slot_count)])
+        db.session.commit()
+
+    day = (datetime.now() + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
+    half = slot_count // 2
+    single_items = make_items(list(range(1, half + 1)), args.items, day)
+    bulk_items = make_items(list(range(half + 1, slot_count + 1)), args.items, day)
+    client = app.test_client()
+
+    started = time.perf_counter()
+    for item in single_items:
+        response = client.post('/api/book', json={'user_id': 1, **item})
+        assert response.status_code == 201, response.get_json()
+    single_time = time.perf_counter() - started
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa.event.listen(engine, 'before_cursor_execute', record)
+    started = time.perf_counter()
+    response = client.post('/api/book/bulk', json={'user_id': 1, 'items': bulk_items})
+    bulk_time = time.perf_counter() - started
+    sa.event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 201, response.get_json()['message']
+    booking_ids = [result['booking_id'] for result in response.get_json()['results']]
+    with app.app_context():
+        stored = dict(db.session.query(app_module.Booking.id, app_module.Booking.start_time).filter(
+            app_module.Booking.id.in_(booking_ids)))
+    assert len(set(booking_ids)) == args.items and all(
+        stored[booking_id].isoformat() == item['start_time'] for booking_id, item in zip(booking_ids, bulk_items))
+    inserts = sum(statement.startswith('INSERT INTO booking') for statement in statements)
+
+    repeat = client.post('/api/book/bulk', json={'user_id': 1, 'items': bulk_items[:5], 'mode': 'best_effort'})
+    assert repeat.status_code == 409 and all(r['status'] == 'conflict' for r in repeat.get_json()['results'])
+
+    print(f"items={args.items}")
+    print(f"{args.items} single calls: {single_time * 1000:8.1f} ms ({args.items / single_time:7.0f} bookings/s)")
+    print(f"one bulk call:    {bulk_time * 1000:8.1f} ms ({args.items / bulk_time:7.0f} bookings/s), "
+          f"{len(statements)} SQL statements, {inserts} INSERT INTO booking")
+
+
+if __name__ == '__main__':
+    main()
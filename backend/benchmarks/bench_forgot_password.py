@@ -0,0 +1,66 @@
+"""Measure /api/forgot-password latency with mail handed to the background dispatcher.
+
+A local fake SMTP server with a configurable handshake delay stands in for
+Gmail. The run reports request latency, how many SMTP connections the
+dispatcher needed and the dispatcher's own counters.
+
+Usage: python benchmarks/bench_forgot_password.py [--requests N] [--smtp-delay SECONDS]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from fake_smtp import FakeSMTPServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--smtp-delay', type=float, default=0.5)
+    args = parser.parse_args()
+
+    smtp = FakeSMTPServer(connect_delay=args.smtp_delay).start()
+    os.environ.update({
+        'MAIL_SERVER': '127.0.0.1',
+        'MAIL_PORT': str(smtp.port),
+        'MAIL_USE_TLS': 'false',
+        'MAIL_DEFAULT_SENDER': 'noreply@example.com',
+    })
+
+    from common import load_app
+    app_module, app = load_app()
+    db = app_module.db
+    with app.app_context():
+        db.session.bulk_insert_mappings(app_module.User, [
+            {'name': f'User {i}', 'username': f'user{i}', 'email': f'user{i}@example.com', 'password': 'x'}
+            for i in range(args.requests)
+        ])
+        db.session.commit()
+
+    client = app.test_client()
+    latencies = []
+    for i in range(args.requests):
+        started = time.perf_counter()
+        response = client.post('/api/forgot-password', json={'email': f'user{i}@example.com'})
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.get_json()
+
+    drain_started = time.perf_counter()
+    app_module.mail_dispatcher.join()
+    drain_time = time.perf_counter() - drain_started
+
+    latencies.sort()
+    print(f"requests={args.requests} smtp handshake delay={args.smtp_delay}s")
+    print(f"request latency p50={statistics.median(latencies) * 1000:.2f} ms "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms")
+    print(f"queue drained in {drain_time:.2f}s over {smtp.connections} SMTP connections")
+    print(f"messages delivered: {len(smtp.messages)}")
+    print(f"dispatcher stats: {app_module.mail_dispatcher.stats()}")
+    if len(smtp.messages) != args.requests:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
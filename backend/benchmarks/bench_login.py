@@ -0,0 +1,76 @@
+"""Login throughput before and after transparent rehashing to the configured policy.
+
+Users are seeded with hashes made under --legacy-method. The first round of
+logins verifies those and rehashes them to --method; the second round runs
+entirely under the new policy. A final burst sends more concurrent logins
+than the hasher admits (--workers plus --max-pending) and reports how many
+were turned away with 503 instead of tying up request threads.
+
+Usage: python benchmarks/bench_login.py [--users N] [--threads T]
+       [--legacy-method scrypt] [--method pbkdf2:sha256:100000] [--max-pending P]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--legacy-method', default='pbkdf2:sha256:1000000')
+    parser.add_argument('--method', default='pbkdf2:sha256:100000')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-pending', type=int, default=4)
+    args = parser.parse_args()
+
+    os.environ['PASSWORD_HASH_METHOD'] = args.method
+    os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+    os.environ['PASSWORD_HASH_MAX_PENDING'] = str(args.max_pending)
+    from common import load_app
+    app_module, app = load_app()
+    db, User = app_module.db, app_module.User
+
+    # One legacy hash shared by every user keeps seeding fast
+    legacy_hash = generate_password_hash('secret', method=args.legacy_method)
+    with app.app_context():
+        db.session.bulk_insert_mappings(User, [
+            {'name': f'User {i}', 'username': f'user{i}', 'email': f'user{i}@example.com', 'password': legacy_hash}
+            for i in range(args.users)
+        ])
+        db.session.commit()
+
+    def login(i):
+        client = app.test_client()
+        response = client.post('/api/login', json={'identifier': f'user{i}', 'password': 'secret'})
+        assert response.status_code == 200, response.status_code
+
+    for label in ('legacy hashes (rehashing)', 'current policy'):
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            started = time.perf_counter()
+            list(pool.map(login, range(args.users)))
+            elapsed = time.perf_counter() - started
+        print(f"{label:26} {args.users / elapsed:8.1f} logins/s")
+
+    with app.app_context():
+        upgraded = sum(1 for (password,) in db.session.query(User.password)
+                       if not app_module.password_hasher.needs_rehash(password))
+    print(f"users on current policy ({args.method}): {upgraded}/{args.users}")
+
+    burst = min(args.users, 4 * (args.workers + args.max_pending))
+    statuses = []
+
+    def burst_login(i):
+        response = app.test_client().post('/api/login', json={'identifier': f'user{i}', 'password': 'secret'})
+        statuses.append(response.status_code)
+
+    with ThreadPoolExecutor(max_workers=burst) as pool:
+        list(pool.map(burst_login, range(burst)))
+    print(f"burst of {burst} concurrent logins: {statuses.count(200)} served, {statuses.count(503)} turned away with 503")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Compare login identifier resolution strategies on a large user table.
+
+Times the original username-OR-email filter, the '@'-routed probes of
+find_user_by_identifier with the identifier cache cleared, and the same
+lookups served warm from the cache. Half of the lookups are for
+identifiers that do not exist.
+
+Usage: python benchmarks/bench_login_lookup.py [--users N] [--lookups M]
+"""
+import argparse
+import random
+import time
+
+from common import load_app
+
+SEED_BATCH = 50000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=1000000)
+    parser.add_argument('--lookups', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    app_module, app = load_app()
+    db, User = app_module.db, app_module.User
+
+    started = time.perf_counter()
+    with app.app_context():
+        for offset in range(0, args.users, SEED_BATCH):
+            db.session.bulk_insert_mappings(User, [
+                {'name': f'User {i}', 'username': f'user{i}', 'email': f'user{i}@example.com', 'password': 'x'}
+                for i in range(offset, min(offset + SEED_BATCH, args.users))
+            ])
+            db.session.commit()
+    print(f"seeded {args.users} users in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(args.seed)
+    identifiers = []
+    for _ in range(args.lookups):
+        i = rng.randrange(args.users * 2)
+        identifiers.append(f'user{i}@example.com' if rng.random() < 0.5 else f'user{i}')
+
+    def legacy():
+        for identifier in identifiers:
+            User.query.filter((User.username == identifier) | (User.email == identifier)).first()
+
+    def routed():
+        for identifier in identifiers:
+            app_module.find_user_by_identifier(identifier)
+
+    with app.app_context():
+        for label, run, clear in (('username OR email', legacy, False),
+                                  ("'@'-routed probes", routed, True),
+                                  ('identifier cache', routed, False)):
+            if clear:
+                app_module.login_identifier_cache.clear()
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            db.session.expunge_all()
+            print(f"{label:18} {elapsed / args.lookups * 1e6:8.1f} us/lookup")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Compare the legacy per-slot availability computation with the sweep engine.
+
+Usage: python benchmarks/bench_parking_slots.py [--slots N] [--bookings M]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+from common import load_app, timed
+
+
+def legacy_parking_slots(app_module):
+    """The original N+1 implementation of GET /api/parking-slots, kept for comparison."""
+    ParkingSlot, Booking = app_module.ParkingSlot, app_module.Booking
+    slots = ParkingSlot.query.all()
+    current_time = datetime.utcnow()
+    tomorrow = current_time + timedelta(days=1)
+    start_of_today = current_time.replace(hour=8, minute=0, second=0, microsecond=0)
+    end_of_today = current_time.replace(hour=22, minute=0, second=0, microsecond=0)
+    start_of_tomorrow = tomorrow.replace(hour=8, minute=0, second=0, microsecond=0)
+    end_of_tomorrow = tomorrow.replace(hour=22, minute=0, second=0, microsecond=0)
+
+    slot_info = []
+    for slot in slots:
+        bookings = Booking.query.filter(
+            Booking.slot_id == slot.id,
+            Booking.end_time > start_of_today,
+            Booking.start_time < end_of_tomorrow
+        ).order_by(Booking.start_time).all()
+        availability = {
+            'today': [{'start': start_of_today.isoformat(), 'end': end_of_today.isoformat()}],
+            'tomorrow': [{'start': start_of_tomorrow.isoformat(), 'end': end_of_tomorrow.isoformat()}],
+        }
+        for booking in bookings:
+            day = 'today' if booking.start_time.date() == current_time.date() else 'tomorrow'
+            new_day_availability = []
+            for avail_slot in availability[day]:
+                avail_start = datetime.fromisoformat(avail_slot['start'])
+                avail_end = datetime.fromisoformat(avail_slot['end'])
+                if booking.start_time >= avail_end or booking.end_time <= avail_start:
+                    new_day_availability.append(avail_slot)
+                else:
+                    if avail_start < booking.start_time:
+                        new_day_availability.append({'start': avail_start.isoformat(),
+                                                     'end': booking.start_time.isoformat()})
+                    if booking.end_time < avail_end:
+                        new_day_availability.append({'start': booking.end_time.isoformat(),
+                                                     'end': avail_end.isoformat()})
+            availability[day] = new_day_availability
+        slot_info.append({'id': slot.id, 'name': slot.name, 'lot_id': slot.lot_id, 'availability': availability})
+    return slot_info
+
+
+def seed(app_module, slot_count, booking_count, rng):
+    db, User, ParkingSlot, Booking = app_module.db, app_module.User, app_module.ParkingSlot, app_module.Booking
+    db.session.add(User(name='Bench', username='bench', email='bench@example.com', password='x'))
+    db.session.bulk_insert_mappings(ParkingSlot, [{'name': f'S{i}'} for i in range(slot_count)])
+    db.session.commit()
+    user_id = User.query.filter_by(username='bench').one().id
+
+    now = datetime.utcnow()
+    days = [now.replace(hour=8, minute=0, second=0, microsecond=0) + timedelta(days=offset) for offset in (0, 1)]
+    rows = []
+    for _ in range(booking_count):
+        # Overlaps are allowed so the comparison also covers data the legacy code tolerated
+        day = rng.choice(days)
+        start = day + timedelta(minutes=30 * rng.randrange(0, 27))
+        end = start + timedelta(minutes=30 * rng.randint(1, 4))
+        end = min(end, day.replace(hour=22))
+        rows.append({'user_id': user_id, 'slot_id': rng.randint(1, slot_count),
+                     'start_time': start, 'end_time': end, 'vehicle_type': 'car'})
+    db.session.bulk_insert_mappings(Booking, rows)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--slots', type=int, default=2000)
+    parser.add_argument('--bookings', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app_module, app = load_app()
+    with app.app_context():
+        seed(app_module, args.slots, args.bookings, random.Random(args.seed))
+        legacy_time, legacy_result = timed(lambda: legacy_parking_slots(app_module), args.repeat)
+
+    client = app.test_client()
+
+    def cold():
+        app_module.availability_cache.clear()
+        return client.get('/api/parking-slots')
+
+    new_time, response = timed(cold, args.repeat)
+    assert response.get_json() == legacy_result, 'engine output differs from legacy output'
+
+    warm_time, response = timed(lambda: client.get('/api/parking-slots'), args.repeat)
+    assert response.get_json() == legacy_result, 'cached output differs from legacy output'
+
+    etag = response.headers['ETag']
+    revalidate_time, response = timed(
+        lambda: client.get('/api/parking-slots', headers={'If-None-Match': etag}), args.repeat)
+    assert response.status_code == 304
+
+    print(f"slots={args.slots} bookings={args.bookings}")
+    print(f"legacy per-slot queries: {legacy_time * 1000:.1f} ms")
+    print(f"single-query sweep:      {new_time * 1000:.1f} ms (includes HTTP + JSON encoding)")
+    print(f"cached availability:     {warm_time * 1000:.1f} ms")
+    print(f"If-None-Match (304):     {revalidate_time * 1000:.3f} ms")
+    print(f"speedup (cold): {legacy_time / new_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Measure the retention job and check that it archives exactly the old rows.
+
+Seeds old and recent bookings plus expired and live password reset tokens,
+runs run_retention while another thread keeps booking, and reports rows/s
+along with the worst booking latency seen during the run (long locks
+would show up there).
+
+Usage: python benchmarks/bench_retention.py [--old N] [--recent M] [--batch-size B]
+"""
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+
+from common import Checks, load_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--old', type=int, default=50000, help='bookings past the retention horizon')
+    parser.add_argument('--recent', type=int, default=5000, help='bookings inside the horizon')
+    parser.add_argument('--resets', type=int, default=5000, help='expired password reset tokens')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=90)
+    args = parser.parse_args()
+
+    app_module, app = load_app({'LOG_LEVEL': 'OFF'})
+    db = app_module.db
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    with app.app_context():
+        db.session.add(app_module.User(name='Driver', username='driver', email='driver@example.com', password='x'))
+        db.session.bulk_insert_mappings(app_module.ParkingSlot, [{'name': f'S{i}'} for i in range(20)])
+
+        def bookings(count, first_day):
+            return [{'user_id': 1, 'slot_id': n % 20 + 1,
+                     'start_time': first_day - timedelta(hours=n // 20), 'end_time': first_day - timedelta(hours=n // 20 - 1),
+                     'vehicle_type': 'car'} for n in range(count)]
+        db.session.bulk_insert_mappings(app_module.Booking, bookings(args.old, now - timedelta(days=args.days + 1)))
+        db.session.bulk_insert_mappings(app_module.Booking, bookings(args.recent, now - timedelta(days=1)))
+        db.session.bulk_insert_mappings(app_module.PasswordReset, [
+            {'user_id': 1, 'token': f'expired-{n}', 'expires_at': datetime.utcnow() - timedelta(hours=1)}
+            for n in range(args.resets)
+        ] + [{'user_id': 1, 'token': 'live', 'expires_at': datetime.utcnow() + timedelta(hours=1)}])
+        db.session.commit()
+        archived_ids = {booking_id for (booking_id,) in db.session.query(app_module.Booking.id).filter(
+            app_module.Booking.end_time < now - timedelta(days=args.days))}
+
+    check = Checks()
+
+    stop = threading.Event()
+    latencies = []
+
+    def keep_booking():
+        client = app.test_client()
+        start = (now + timedelta(days=1)).replace(hour=8)
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.post('/api/book', json={'user_id': 1, 'slot_id': 1, 'start_time': start.isoformat(),
+                                           'end_time': (start + timedelta(minutes=1)).isoformat(), 'vehicle_type': 'car'})
+            latencies.append(time.perf_counter() - started)
+            start += timedelta(minutes=1)
+
+    booker = threading.Thread(target=keep_booking)
+    booker.start()
+    with app.app_context():
+        stats = app_module.run_retention(args.days, args.batch_size)
+    stop.set()
+    booker.join()
+
+    print(f"deleted {stats['password_resets_deleted']} resets, archived {stats['bookings_archived']} bookings "
+          f"in {stats['seconds']}s ({stats['rows_per_second']} rows/s, batch {args.batch_size})")
+    if latencies:
+        print(f"{len(latencies)} concurrent bookings, slowest {max(latencies) * 1e3:.1f} ms")
+
+    with app.app_context():
+        check('every expired reset token is deleted', stats['password_resets_deleted'] == args.resets)
+        check('live reset tokens are kept', app_module.PasswordReset.query.count() == 1)
+        archive_ids = {booking_id for (booking_id,) in db.session.query(app_module.BookingArchive.id)}
+        check('exactly the old bookings are archived', archive_ids == archived_ids and stats['bookings_archived'] == args.old)
+        check('archived bookings are gone from booking',
+              db.session.query(app_module.Booking.id).filter(app_module.Booking.id.in_(list(archived_ids)[:1000])).count() == 0)
+        check('recent bookings stay', app_module.Booking.query.count() == args.recent + len(latencies))
+        check('a second run has nothing to do', sum(app_module.run_retention(args.days, args.batch_size)[name] for name in (
+              'password_resets_deleted', 'idempotency_keys_deleted', 'bookings_archived')) == 0)
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Measure per-worker startup time of the application factory.
+
+Each sample is a fresh Python process that imports the app and calls
+create_app(), as a gunicorn worker would. With --with-create-all the
+process also runs db.create_all(), which is what every worker paid when
+the schema was created at import time.
+
+Usage: python benchmarks/bench_startup.py [--samples N] [--database-url URL]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from common import BACKEND_DIR, BENCHMARK_SECRET_KEY, load_app, temp_db_url
+
+WORKER_SCRIPT = '''
+import time
+started = time.perf_counter()
+import app as app_module
+app = app_module.create_app()
+if {create_all}:
+    with app.app_context():
+        app_module.db.create_all()
+print(time.perf_counter() - started)
+'''
+
+
+def sample(database_url, create_all):
+    env = dict(os.environ, DATABASE_URL=database_url, SECRET_KEY=BENCHMARK_SECRET_KEY)
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER_SCRIPT.format(create_all=create_all)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=10)
+    parser.add_argument('--database-url', help='defaults to a fresh SQLite file with the schema created')
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = temp_db_url()
+        load_app({'SQLALCHEMY_DATABASE_URI': database_url})
+
+    for label, create_all in (('create_app()', False), ('create_app() + create_all()', True)):
+        timings = sorted(sample(database_url, create_all) for _ in range(args.samples))
+        print(f"{label:28} median={statistics.median(timings) * 1000:.1f} ms max={timings[-1] * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
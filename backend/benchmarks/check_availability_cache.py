@@ -0,0 +1,81 @@
+"""Check that cached availability follows writes this process did not make.
+
+1. A booking committed the way another worker commits it (row plus a slot
+   version bump) shows up on the very next /api/parking-slots request, and
+   the old ETag no longer gets a 304.
+2. A cancellation made the same way frees the window again.
+3. A booking inserted outside the application, without a version bump,
+   shows up on the next request too.
+4. Without writes the ETag stays the same past AVAILABILITY_CACHE_TTL, so
+   clients polling slower than the TTL still get 304.
+
+Usage: python benchmarks/check_availability_cache.py
+"""
+import time
+from datetime import datetime, timedelta
+
+from common import Checks, load_app
+
+TTL = 1
+
+
+def main():
+    app_module, app = load_app({'LOG_LEVEL': 'OFF', 'AVAILABILITY_CACHE_TTL': TTL})
+    db, sa, Booking, ParkingSlot = app_module.db, app_module.sa, app_module.Booking, app_module.ParkingSlot
+    with app.app_context():
+        db.session.add(app_module.User(name='Driver', username='driver', email='driver@example.com', password='x'))
+        db.session.bulk_insert_mappings(ParkingSlot, [{'name': f'S{i}'} for i in range(1, 4)])
+        db.session.commit()
+
+    check = Checks()
+
+    client = app.test_client()
+    start = (datetime.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+
+    def tomorrow(slot_id):
+        response = client.get('/api/parking-slots')
+        slot = next(slot for slot in response.get_json() if slot['id'] == slot_id)
+        return response.headers['ETag'], len(slot['availability']['tomorrow'])
+
+    def write(slot_id, hours, bump=True):
+        # What another worker's reserve_slot or cancel_booking commits, bypassing this process
+        with app.app_context():
+            if hours is None:
+                db.session.execute(sa.delete(Booking).where(Booking.slot_id == slot_id))
+            else:
+                db.session.add(Booking(user_id=1, slot_id=slot_id, vehicle_type='car',
+                                       start_time=start + timedelta(hours=hours),
+                                       end_time=start + timedelta(hours=hours + 1)))
+            if bump:
+                db.session.execute(sa.update(ParkingSlot).where(ParkingSlot.id == slot_id).values(
+                    version=ParkingSlot.version + 1))
+            db.session.commit()
+
+    etag, intervals = tomorrow(1)
+    check('an unchanged listing revalidates with 304',
+          client.get('/api/parking-slots', headers={'If-None-Match': etag}).status_code == 304)
+
+    write(1, 2)
+    new_etag, intervals = tomorrow(1)
+    check("another worker's booking is visible on the next request", intervals == 2)
+    check("another worker's booking changes the ETag", new_etag != etag)
+    check('the old ETag is answered with the new listing',
+          client.get('/api/parking-slots', headers={'If-None-Match': etag}).status_code == 200)
+
+    write(1, None)
+    check("another worker's cancellation is visible on the next request", tomorrow(1)[1] == 1)
+
+    etag, _ = tomorrow(2)
+    write(2, 4, bump=False)
+    new_etag, intervals = tomorrow(2)
+    check('a write made outside the app is visible on the next request', intervals == 2 and new_etag != etag)
+
+    time.sleep(TTL + 0.1)
+    check('an idle listing still revalidates with 304 after the TTL',
+          client.get('/api/parking-slots', headers={'If-None-Match': new_etag}).status_code == 304)
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Check Idempotency-Key handling on booking, cancellation and complaint writes.
+
+Fires concurrent duplicates of each write with one key and asserts exactly
+one row is written and every caller gets the same response. Keys live in
+the idempotency_key table, so every worker sees them. Also checks that
+replays run one lookup query and keep the read-after-write token, that a
+key reused for a different body is rejected, that a claim abandoned by a
+crashed worker is taken over after its lease, and that expired keys run
+the request again.
+
+Usage: python benchmarks/check_idempotency.py [--concurrency N]
+"""
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta
+
+from common import Checks, load_app
+
+TTL = 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    app_module, app = load_app({'LOG_LEVEL': 'OFF', 'IDEMPOTENCY_KEY_TTL': TTL})
+    db = app_module.db
+    with app.app_context():
+        db.session.add(app_module.User(name='Driver', username='driver', email='driver@example.com', password='x'))
+        db.session.bulk_insert_mappings(app_module.ParkingSlot, [{'name': f'S{i}'} for i in range(1, 11)])
+        db.session.commit()
+
+    check = Checks()
+
+    def count(model):
+        with app.app_context():
+            return db.session.query(model).count()
+
+    def concurrent(path, body, key):
+        barrier = threading.Barrier(args.concurrency)
+        responses = []
+
+        def send():
+            client = app.test_client()
+            barrier.wait()
+            responses.append(client.post(path, json=body, headers={'Idempotency-Key': key}))
+
+        threads = [threading.Thread(target=send) for _ in range(args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def same_response(responses, status):
+        return (all(response.status_code == status for response in responses)
+                and len({response.get_data() for response in responses}) == 1
+                and sum(response.headers.get('Idempotent-Replayed') == 'true' for response in responses) == len(responses) - 1)
+
+    start = (datetime.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+    booking = {'user_id': 1, 'slot_id': 'any', 'vehicle_type': 'car', 'start_time': start.isoformat(),
+               'end_time': (start + timedelta(hours=1)).isoformat()}
+    booked = concurrent('/api/book', booking, 'book-1')
+    check(f'{args.concurrency} concurrent duplicate bookings write one row', count(app_module.Booking) == 1)
+    check('every duplicate booking gets the original 201', same_response(booked, 201))
+
+    complaint = {'user_id': 1, 'slot_name': 'S1', 'description': 'Blocked by a van'}
+    responses = concurrent('/api/complaint', complaint, 'complaint-1')
+    check('concurrent duplicate complaints write one row', count(app_module.Complaint) == 1)
+    check('every duplicate complaint gets the original 201', same_response(responses, 201))
+
+    responses = concurrent('/api/cancel-booking', {'booking_id': booked[0].get_json()['booking_id']}, 'cancel-1')
+    check('concurrent duplicate cancellations delete once', count(app_module.Booking) == 0)
+    check('every duplicate cancellation gets the original 200', same_response(responses, 200))
+
+    client = app.test_client()
+    queries_before = app_module.request_metrics.query_totals().get(('api.book_slot', 'POST'), (0, 0))
+    started = time.perf_counter()
+    replays = [client.post('/api/book', json=booking, headers={'Idempotency-Key': 'book-1'}) for _ in range(100)]
+    replay_ms = (time.perf_counter() - started) * 1000 / len(replays)
+    requests, queries = app_module.request_metrics.query_totals()[('api.book_slot', 'POST')]
+    check('replays run one lookup query each',
+          requests - queries_before[0] == len(replays) and queries - queries_before[1] == len(replays))
+    check('replays keep the original status', all(response.status_code == 201 for response in replays))
+    check('replays keep the read-after-write token',
+          replays[0].headers.get('X-Read-After-Write') == booked[0].headers.get('X-Read-After-Write') is not None)
+    check('responses are stored in the table shared by every worker',
+          count(app_module.IdempotencyKey) == 3)
+
+    # A worker that died mid-request leaves its claim without a response
+    with app.app_context():
+        db.session.add(app_module.IdempotencyKey(endpoint='complaint', idempotency_key='crashed', fingerprint='',
+                                                 expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+    check("a crashed worker's claim is taken over after its lease",
+          client.post('/api/complaint', json=complaint, headers={'Idempotency-Key': 'crashed'}).status_code == 201)
+
+    other = dict(booking, slot_id=2)
+    check('a key reused for a different body is rejected',
+          client.post('/api/book', json=other, headers={'Idempotency-Key': 'book-1'}).status_code == 422)
+    check('requests without a key are not deduplicated',
+          [client.post('/api/complaint', json=complaint).status_code for _ in range(2)] == [201, 201]
+          and count(app_module.Complaint) == 4)
+
+    time.sleep(TTL + 0.1)
+    check('an expired key runs the request again',
+          client.post('/api/complaint', json=complaint, headers={'Idempotency-Key': 'complaint-1'}).status_code == 201
+          and count(app_module.Complaint) == 5)
+    print(f"replayed responses: {replay_ms:.2f} ms each, {app_module.idempotency_keys.replayed} replays in total")
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
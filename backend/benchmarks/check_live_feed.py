@@ -0,0 +1,117 @@
+"""Check and measure the live availability feed without any external broker.
+
+1. Streams /api/parking-slots/stream through the test client and asserts that
+   a booking and its cancellation each push a delta for the right slot/day.
+2. Holds thousands of idle subscribers (plain generators, no thread each),
+   publishes one event and times the fan-out to all of them.
+3. Checks Last-Event-ID resumption, and the reset sent to lagging subscribers
+   and to ids issued by another worker or before a restart.
+
+Usage: python benchmarks/check_live_feed.py [subscribers]
+"""
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from common import Checks, load_app
+
+from events import EventBroker
+
+
+def parse_events(chunk):
+    events = []
+    for message in chunk.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.split('\n') if ': ' in line and not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['id'], fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def main():
+    subscribers = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app_module, app = load_app({'LIVE_FEED_HEARTBEAT_SECONDS': 1})
+    with app.app_context():
+        app_module.db.session.add(app_module.User(name='Driver', username='driver', email='driver@example.com', password='x'))
+        app_module.db.session.add(app_module.ParkingSlot(name='A1'))
+        app_module.db.session.commit()
+
+    client = app.test_client()
+    check = Checks()
+
+    response = client.get('/api/parking-slots/stream', buffered=False)
+    check('stream is served as text/event-stream', response.mimetype == 'text/event-stream')
+    stream = (chunk.decode() for chunk in response.response)
+    check('stream opens with a retry hint', next(stream).startswith('retry:'))
+
+    start = (datetime.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+    booked = client.post('/api/book', json={'user_id': 1, 'slot_id': 1, 'start_time': start.isoformat(),
+                                            'end_time': (start + timedelta(hours=1)).isoformat(),
+                                            'vehicle_type': 'car'})
+    events = parse_events(next(stream))
+    check('booking pushes one availability delta', len(events) == 1 and events[0][1] == 'availability')
+    delta = events[0][2] if events else {}
+    check('delta names the slot and day', delta.get('slot_id') == 1 and delta.get('date') == start.date().isoformat())
+    check('delta carries the split free intervals', len(delta.get('availability', [])) == 2)
+
+    client.post('/api/cancel-booking', json={'booking_id': booked.get_json()['booking_id']})
+    events = parse_events(next(stream))
+    check('cancellation restores the full day', len(events) == 1 and len(events[0][2]['availability']) == 1)
+    check('idle stream sends keepalives', next(stream).startswith(':'))
+    response.close()
+    check('closed stream unsubscribes', app_module.availability_feed.subscribers == 0)
+
+    # Fan-out to many idle subscribers
+    broker = EventBroker(history=100, heartbeat=1)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    streams = [broker.stream() for _ in range(subscribers)]
+    for subscriber in streams:
+        next(subscriber)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    broker.publish('availability', {'slot_id': 1, 'day': 'today', 'availability': []})
+    publish_seconds = time.perf_counter() - started
+    received = sum('event: availability' in next(subscriber) for subscriber in streams)
+    fan_out_seconds = time.perf_counter() - started
+    check(f'all {subscribers} idle subscribers receive the event', received == subscribers)
+    print(f"publish {publish_seconds * 1e6:.1f} us, delivery to {subscribers} subscribers "
+          f"{fan_out_seconds * 1e3:.1f} ms, ~{per_subscriber:.0f} bytes per idle subscriber")
+    for subscriber in streams:
+        subscriber.close()
+
+    # Resumption and lagging subscribers
+    for number in range(5):
+        broker.publish('availability', {'n': number})
+    resumed = broker.stream(last_event_id=f'{broker.epoch}-{broker._seq - 2}')
+    next(resumed)
+    check('Last-Event-ID replays only the missed events', [e[2]['n'] for e in parse_events(next(resumed))] == [3, 4])
+    resumed.close()
+    lagging = broker.stream(last_event_id=f'{broker.epoch}-0')
+    next(lagging)
+    for number in range(150):
+        broker.publish('availability', {'n': number})
+    check('subscriber behind the history gets a reset', parse_events(next(lagging))[0][1] == 'reset')
+    lagging.close()
+
+    # Ids this broker did not issue: another worker's feed, or this one before a restart
+    restarted = EventBroker(history=100, heartbeat=1)
+    for number in range(2):
+        restarted.publish('availability', {'n': number})
+    for label, last_event_id in (('an id ahead of this process', f'{restarted.epoch}-50'),
+                                 ("another worker's id", f'{broker.epoch}-1'),
+                                 ('a malformed id', 'abc')):
+        foreign = restarted.stream(last_event_id=last_event_id)
+        next(foreign)
+        check(f'{label} gets a reset', [(e[0], e[1]) for e in parse_events(next(foreign))]
+              == [(f'{restarted.epoch}-2', 'reset')])
+        foreign.close()
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
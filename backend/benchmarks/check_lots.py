@@ -0,0 +1,199 @@
+"""Check multi-lot availability and booking rules, and that range queries stay bounded.
+
+1. Sets up the default lot (8:00-22:00, today or tomorrow) next to a night
+   garage (18:00-24:00, bookable 30 days ahead) and checks listings, range
+   queries, per-lot booking rules, auto-assignment within a lot, bulk
+   booking and cancellation.
+2. Times a cold 30-day availability query for one lot, then adds a long
+   booking history and times it again: the query reads by start_time
+   range, so its cost follows the window, not the table size.
+
+Usage: python benchmarks/check_lots.py [--slots N] [--history-days D]
+"""
+import argparse
+import random
+from datetime import datetime, time, timedelta
+
+from common import Checks, load_app, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--slots', type=int, default=100, help='slots per lot')
+    parser.add_argument('--history-days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    app_module, app = load_app({'LOG_LEVEL': 'OFF'})
+    db = app_module.db
+    with app.app_context():
+        db.session.add(app_module.User(name='Driver', username='driver', email='driver@example.com', password='x'))
+        db.session.add(app_module.Lot(id=2, name='Night garage', opening_hour=18, closing_hour=24, booking_horizon_days=30))
+        db.session.bulk_insert_mappings(app_module.ParkingSlot, [
+            {'name': f'{prefix}{i}', 'lot_id': lot_id}
+            for lot_id, prefix in ((1, 'A'), (2, 'N')) for i in range(1, args.slots + 1)])
+        db.session.commit()
+    app_module.lot_cache.clear()
+
+    check = Checks()
+
+    client = app.test_client()
+    today = datetime.now().date()
+    night_slot, day_slot = args.slots + 1, 1
+
+    lots = client.get('/api/lots').get_json()
+    check('both lots are listed with their hours',
+          [(lot['id'], lot['opening_hour'], lot['closing_hour']) for lot in lots] == [(1, 8, 22), (2, 18, 24)])
+
+    listing = client.get('/api/parking-slots').get_json()
+    check('the default listing covers every lot', len(listing) == 2 * args.slots)
+    night = next(slot for slot in listing if slot['id'] == night_slot)
+    check('each lot keeps its own hours', night['lot_id'] == 2 and night['availability']['today'] == [{
+        'start': datetime.combine(today, time(18)).isoformat(),
+        'end': datetime.combine(today + timedelta(days=1), time.min).isoformat()}])
+
+    last_day = today + timedelta(days=29)
+    url = f'/api/parking-slots?lot_id=2&from={today}&to={last_day}'
+    ranged = client.get(url).get_json()
+    check('a range query lists only the lot', {slot['lot_id'] for slot in ranged} == {2})
+    check('a range query is keyed by date', sorted(ranged[0]['availability']) == [
+        (today + timedelta(days=offset)).isoformat() for offset in range(30)])
+    check('ranges over the limit are rejected',
+          client.get(f'/api/parking-slots?from={today}&to={today + timedelta(days=40)}').status_code == 400)
+    check('unknown lots are 404', client.get('/api/parking-slots?lot_id=99').status_code == 404)
+
+    def book(slot_id, day, start_hour, end_hour, **extra):
+        start = datetime.combine(day, time.min) + timedelta(hours=start_hour)
+        return client.post('/api/book', json={'user_id': 1, 'slot_id': slot_id, 'vehicle_type': 'car',
+                                              'start_time': start.isoformat(),
+                                              'end_time': (start + timedelta(hours=end_hour - start_hour)).isoformat(),
+                                              **extra})
+
+    far_day = today + timedelta(days=20)
+    check('the night garage books 20 days ahead until midnight', book(night_slot, far_day, 20, 24).status_code == 201)
+    rejected = book(day_slot, far_day, 9, 10)
+    check('the default lot keeps its two-day horizon', rejected.status_code == 400
+          and rejected.get_json()['message'] == 'Bookings are only allowed for today or tomorrow')
+    rejected = book(night_slot, far_day, 10, 11)
+    check("bookings outside a lot's hours are rejected", rejected.status_code == 400
+          and rejected.get_json()['message'] == 'Bookings are only allowed between 6:00 PM and 12:00 AM')
+    check('bookings beyond the horizon are rejected',
+          book(night_slot, today + timedelta(days=31), 19, 20).status_code == 400)
+
+    ranged = client.get(url).get_json()
+    slot = next(slot for slot in ranged if slot['id'] == night_slot)
+    check('the range listing reflects the booking', slot['availability'][far_day.isoformat()] == [{
+        'start': datetime.combine(far_day, time(18)).isoformat(),
+        'end': datetime.combine(far_day, time(20)).isoformat()}])
+
+    with app.app_context():
+        engine = db.engine
+
+    def transactions_of(request):
+        # Statements per transaction, to see what a lock's transaction read before it
+        transactions = [[]]
+        listeners = [('before_cursor_execute', lambda conn, cursor, statement, *args: transactions[-1].append(statement)),
+                     ('rollback', lambda conn: transactions.append([])),
+                     ('commit', lambda conn: transactions.append([]))]
+        for name, listener in listeners:
+            app_module.sa.event.listen(engine, name, listener)
+        response = request()
+        for name, listener in listeners:
+            app_module.sa.event.remove(engine, name, listener)
+        return response, transactions
+
+    def opened_by(transactions, marker):
+        locking = [statements for statements in transactions if any(marker in statement for statement in statements)]
+        return bool(locking) and all(marker in statements[0] for statements in locking)
+
+    app_module.slot_index.forget(2, far_day)
+    assigned, transactions = transactions_of(lambda: book('any', far_day, 19, 21, lot_id=2))
+    with app.app_context():
+        assigned_lot = db.session.get(app_module.ParkingSlot, assigned.get_json().get('slot_id')).lot_id
+    check("auto-assignment stays within the requested lot", assigned.status_code == 201 and assigned_lot == 2)
+    check('the slot lock opens its transaction, after the index loaded the day',
+          opened_by(transactions, 'WHERE parking_slot.id = ?') and 'FROM booking' in ' '.join(transactions[0]))
+    check('a non-numeric lot_id is rejected', book('any', far_day, 19, 21, lot_id='north').status_code == 400)
+
+    bulk, transactions = transactions_of(lambda: client.post('/api/book/bulk', json={'user_id': 1, 'mode': 'best_effort', 'items': [
+        {'slot_id': slot_id, 'vehicle_type': 'bike', 'start_time': f'{day}T{start}', 'end_time': f'{day}T{end}'}
+        for slot_id, day, start, end in ((night_slot + 2, far_day, '18:00', '19:00'),
+                                         (day_slot, far_day, '09:00', '10:00'),
+                                         (day_slot, today + timedelta(days=1), '09:00', '10:00'),
+                                         (10 ** 6, today, '09:00', '10:00'))]}))
+    check('bulk items follow their own lot rules',
+          [result['status'] for result in bulk.get_json()['results']] == ['booked', 'invalid', 'booked', 'slot_not_found'])
+    check('the bulk slot locks open their transaction, after the lot lookup',
+          opened_by(transactions, 'parking_slot.version') and 'parking_slot.lot_id' in ' '.join(transactions[0]))
+
+    # A booking made before lots existed, spanning midnight
+    tomorrow = today + timedelta(days=1)
+    with app.app_context():
+        db.session.add(app_module.Booking(user_id=1, slot_id=2, vehicle_type='car',
+                                          start_time=datetime.combine(today, time(9)),
+                                          end_time=datetime.combine(tomorrow, time(21))))
+        db.session.commit()
+    check('a booking spanning midnight blocks the next day', book(2, tomorrow, 10, 11).status_code == 400)
+    bulk = client.post('/api/book/bulk', json={'user_id': 1, 'mode': 'best_effort', 'items': [
+        {'slot_id': 2, 'vehicle_type': 'car', 'start_time': f'{tomorrow}T12:00', 'end_time': f'{tomorrow}T13:00'}]})
+    check('a booking spanning midnight blocks bulk items on the next day',
+          [result['status'] for result in bulk.get_json()['results']] == ['conflict'])
+
+    # A lot added by another process (flask add-lot) while this one has the lots cached
+    etag = client.get('/api/parking-slots').headers['ETag']
+    with app.app_context():
+        db.session.add(app_module.Lot(id=3, name='Roof', opening_hour=6, closing_hour=20, booking_horizon_days=7))
+        db.session.add(app_module.ParkingSlot(id=10 ** 5, name='R1', lot_id=3))
+        db.session.commit()
+    listing = client.get('/api/parking-slots')
+    check("another process's lot is listed", listing.status_code == 200
+          and any(slot['lot_id'] == 3 for slot in listing.get_json()))
+    check("another process's lot changes the listing ETag", listing.headers['ETag'] != etag)
+    check("another process's lot can be queried", client.get('/api/parking-slots?lot_id=3').status_code == 200)
+    roof_day = today + timedelta(days=6)
+    check("another process's lot can be booked",
+          [book(10 ** 5, roof_day, 6, 7).status_code, book('any', roof_day, 7, 8, lot_id=3).status_code] == [201, 201])
+
+    booking_id = book(night_slot, far_day, 18, 19).get_json()['booking_id']
+    check('cancelling a night garage booking succeeds',
+          client.post('/api/cancel-booking', json={'booking_id': booking_id}).status_code == 200)
+
+    def cold():
+        app_module.availability_cache.clear()
+        return client.get(url)
+
+    empty_seconds, _ = timed(cold)
+
+    # A long history of past bookings in both lots
+    rng = random.Random(args.seed)
+    with app.app_context():
+        rows = []
+        for offset in range(1, args.history_days + 1):
+            day = datetime.combine(today - timedelta(days=offset), time.min)
+            for slot_id in range(1, 2 * args.slots + 1, 2):
+                start = day + timedelta(hours=rng.randint(18, 22))
+                rows.append({'user_id': 1, 'slot_id': slot_id, 'start_time': start,
+                             'end_time': start + timedelta(hours=1), 'vehicle_type': 'car'})
+        db.session.bulk_insert_mappings(app_module.Booking, rows)
+        db.session.commit()
+        db.session.execute(app_module.sa.text('ANALYZE'))
+
+        # The shape of the lot-wide bookings query in load_parking_slots
+        plan = ' '.join(str(row[-1]) for row in db.session.execute(app_module.sa.text(
+            "EXPLAIN QUERY PLAN SELECT slot_id, start_time, end_time FROM booking "
+            "JOIN parking_slot ON parking_slot.id = booking.slot_id WHERE parking_slot.lot_id = 2 "
+            "AND booking.start_time >= :first AND booking.start_time < :last AND booking.end_time > :first"),
+            {'first': datetime.combine(today, time.min), 'last': datetime.combine(last_day, time.max)}))
+    history_seconds, response = timed(cold)
+    check('the range query still succeeds', response.status_code == 200)
+    check('bookings are read through a start_time index range',
+          'INDEX' in plan and 'start_time>? AND start_time<?' in plan)
+    check('a long history does not slow the window query', history_seconds < empty_seconds * 3)
+    print(f"cold 30-day listing of {args.slots} slots: {empty_seconds * 1e3:.1f} ms without history, "
+          f"{history_seconds * 1e3:.1f} ms with {len(rows)} past bookings")
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
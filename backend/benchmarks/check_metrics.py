@@ -0,0 +1,71 @@
+"""Check request metrics, query counting and structured logging.
+
+Drives a few endpoints through the test client, then scrapes
+/api/admin/metrics and asserts the Prometheus histograms, the per-request
+query counts and the too-many-queries warning. Also times /api/login with
+logging on and off to show the cost of the instrumentation.
+
+Usage: python benchmarks/check_metrics.py
+"""
+import io
+import json
+import logging
+import re
+
+from common import Checks, load_app, timed
+
+
+def main():
+    app_module, app = load_app({'QUERY_COUNT_WARNING_THRESHOLD': 1, 'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1'})
+    log_output = io.StringIO()
+    logging.getLogger('parking').handlers[0].stream = log_output
+    with app.app_context():
+        app_module.create_initial_data()
+        app_module.create_admin_user()
+
+    client = app.test_client()
+    check = Checks()
+
+    token = client.post('/api/admin/login', json={'username': 'admin', 'password': 'admin123'}).get_json()['token']
+    for _ in range(3):
+        client.get('/api/parking-slots')
+    client.post('/api/login', json={'identifier': 'nobody', 'password': 'x'})
+
+    response = client.get('/api/admin/metrics', headers={'Authorization': token})
+    check('metrics are served as Prometheus text', response.content_type.startswith('text/plain; version=0.0.4'))
+    body = response.get_data(as_text=True)
+    check('metrics require an admin token', client.get('/api/admin/metrics').status_code == 401)
+
+    count = re.search(r'http_request_duration_seconds_count\{endpoint="api.get_parking_slots",method="GET"\} (\d+)', body)
+    check('latency histogram counts every parking-slots request', count and count.group(1) == '3')
+    inf = re.search(r'http_request_duration_seconds_bucket\{endpoint="api.get_parking_slots",method="GET",le="\+Inf"\} (\d+)', body)
+    check('+Inf bucket matches the count', inf and inf.group(1) == '3')
+    queries = re.search(r'db_queries_per_request_sum\{endpoint="api.get_parking_slots",method="GET"\} (\S+)', body)
+    check('query counts are recorded per endpoint', queries and float(queries.group(1)) >= 3)
+    check('401 responses are counted by status',
+          'http_responses_total{endpoint="api.login",method="POST",status="401"} 1' in body)
+    check('mail dispatcher stats are included', 'mail_queue_depth 0' in body)
+
+    logs = [json.loads(line) for line in log_output.getvalue().splitlines()]
+    warnings = [entry for entry in logs if entry['event'] == 'too_many_queries']
+    check('requests over the query threshold are logged',
+          any(entry['endpoint'] == 'api.get_parking_slots' and entry['queries'] > 1 for entry in warnings))
+    check('failed logins are logged without the request body',
+          any(entry['event'] == 'login_failed' and 'password' not in entry for entry in logs))
+
+    def login():
+        return client.post('/api/login', json={'identifier': 'admin', 'password': 'admin123'})
+
+    logging.getLogger('parking').setLevel(logging.DEBUG)
+    with_logs, _ = timed(lambda: [login() for _ in range(200)], repeat=3)
+    logging.getLogger('parking').setLevel(logging.CRITICAL + 1)
+    log_output.truncate(0)
+    without_logs, _ = timed(lambda: [login() for _ in range(200)], repeat=3)
+    check('LOG_LEVEL=OFF silences the logs', log_output.getvalue() == '')
+    print(f"200 logins: {with_logs * 1e3:.1f} ms with debug logs, {without_logs * 1e3:.1f} ms with logs off")
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Check per-client rate limits and /api/parking-slots request coalescing.
+
+1. Bursts past a small login limit from one address and checks the 429,
+   its Retry-After header and that other addresses are unaffected.
+2. Checks that limits are off by default unless TRUSTED_PROXIES is set,
+   that behind a trusted proxy clients are told apart by X-Forwarded-For,
+   and that 304 revalidations of the slot listing spend no tokens.
+3. Fires concurrent /api/parking-slots requests at a cold cache and counts
+   how many availability computations and SQL queries they caused.
+
+Usage: python benchmarks/check_rate_limit.py [--concurrency N]
+"""
+import argparse
+import os
+import threading
+import time
+
+from common import Checks, load_app
+
+import config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    app_module, app = load_app({
+        'LOG_LEVEL': 'OFF',
+        'RATE_LIMIT_ENABLED': True,
+        'TRUSTED_PROXIES': 1,
+        'RATE_LIMITS': {'login': (3, 60), 'parking_slots': (2, 60)},
+    })
+    with app.app_context():
+        app_module.db.session.bulk_insert_mappings(app_module.ParkingSlot, [{'name': f'S{i}'} for i in range(200)])
+        app_module.db.session.commit()
+
+    check = Checks()
+
+    client = app.test_client()
+    statuses = [client.post('/api/login', json={'identifier': 'nobody', 'password': 'x'}).status_code for _ in range(3)]
+    check('requests within the burst are served', statuses == [401, 401, 401])
+    limited = client.post('/api/login', json={'identifier': 'nobody', 'password': 'x'})
+    check('the next request is rejected with 429', limited.status_code == 429)
+    check('429 carries Retry-After', int(limited.headers.get('Retry-After', 0)) >= 1)
+    other = client.post('/api/login', json={'identifier': 'nobody', 'password': 'x'},
+                        environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    check('other clients keep their own budget', other.status_code == 401)
+    proxied = [client.post('/api/login', json={'identifier': 'nobody', 'password': 'x'},
+                           environ_base={'REMOTE_ADDR': '10.0.0.9'},
+                           headers={'X-Forwarded-For': f'203.0.113.{n % 2}'}).status_code for n in range(6)]
+    check('behind a trusted proxy each forwarded client has its own budget', proxied == [401] * 6)
+
+    environ = dict(os.environ)
+    os.environ.pop('RATE_LIMIT_ENABLED', None)
+    os.environ.pop('TRUSTED_PROXIES', None)
+    check('limits are off by default', config.load_config()['RATE_LIMIT_ENABLED'] is False)
+    os.environ['TRUSTED_PROXIES'] = '1'
+    check('limits are on once a trusted proxy is configured', config.load_config()['RATE_LIMIT_ENABLED'] is True)
+    os.environ.clear()
+    os.environ.update(environ)
+
+    listing = client.get('/api/parking-slots', environ_base={'REMOTE_ADDR': '10.0.0.3'})
+    revalidations = [client.get('/api/parking-slots', environ_base={'REMOTE_ADDR': '10.0.0.3'},
+                                headers={'If-None-Match': listing.headers['ETag']}).status_code for _ in range(5)]
+    check('304 revalidations are not limited', revalidations == [304] * 5)
+    full = [client.get('/api/parking-slots', environ_base={'REMOTE_ADDR': '10.0.0.3'}).status_code for _ in range(2)]
+    check('full listings still spend the budget', [listing.status_code] + full == [200, 200, 429])
+    app_module.rate_limiter.limits['parking_slots'] = (1000, 1)
+
+    # Count real computations by wrapping the loader; the sleep keeps them in flight long enough to overlap
+    computations = []
+    load_parking_slots = app_module.load_parking_slots
+
+    def counting_loader(*args):
+        computations.append(args[0])
+        time.sleep(0.05)
+        return load_parking_slots(*args)
+
+    app_module.load_parking_slots = counting_loader
+    barrier = threading.Barrier(args.concurrency)
+    results = []
+
+    def fetch():
+        local_client = app.test_client()
+        barrier.wait()
+        results.append(local_client.get('/api/parking-slots'))
+
+    queries_before = app_module.request_metrics.query_totals().get(('api.get_parking_slots', 'GET'), (0, 0))[1]
+    threads = [threading.Thread(target=fetch) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queries = app_module.request_metrics.query_totals()[('api.get_parking_slots', 'GET')][1] - queries_before
+    app_module.load_parking_slots = load_parking_slots
+
+    bodies = {response.get_data() for response in results}
+    check('every concurrent request succeeds', all(response.status_code == 200 for response in results))
+    check('every concurrent request gets the same listing', len(bodies) == 1)
+    check('concurrent identical requests share computations', len(computations) < args.concurrency / 4)
+    print(f"{args.concurrency} concurrent requests: {len(computations)} computations, {queries:.0f} SQL queries, "
+          f"{app_module.parking_slot_flights.shared} coalesced")
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Check read-replica routing with two SQLite files standing in for primary and replica.
+
+The "replica" is never written by the app, so anything it returns is
+recognisably stale. The check asserts that read endpoints use it, that a
+client sending back the read-after-write token from its write reads from
+the primary, and that it moves back once the token's window has passed.
+
+Usage: python benchmarks/check_replica_routing.py
+"""
+import shutil
+import time
+from datetime import datetime, timedelta
+
+from common import Checks, load_app, temp_db_url
+
+WINDOW = 0.5
+
+
+def main():
+    replica_url = temp_db_url()
+    app_module, app = load_app({
+        'SQLALCHEMY_BINDS': {'replica': replica_url},
+        'REPLICA_READ_AFTER_WRITE_SECONDS': WINDOW,
+    })
+    db = app_module.db
+    with app.app_context():
+        db.session.add(app_module.User(name='Driver', username='driver', email='driver@example.com', password='x'))
+        db.session.add(app_module.ParkingSlot(name='A1'))
+        db.session.commit()
+        # "Replicate" the seed data once; later writes only reach the primary
+        shutil.copyfile(db.engines[None].url.database, db.engines['replica'].url.database)
+
+    client, other_client = app.test_client(), app.test_client()
+    check = Checks()
+
+    start = (datetime.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+    response = client.post('/api/book', json={'user_id': 1, 'slot_id': 1, 'start_time': start.isoformat(),
+                                              'end_time': (start + timedelta(hours=1)).isoformat(),
+                                              'vehicle_type': 'car'})
+    check('booking is written to the primary', response.status_code == 201)
+    # The writer sends its token back, as the frontend does; nothing is remembered server-side
+    token = {'X-Read-After-Write': response.headers.get('X-Read-After-Write', '')}
+    check('the write hands out a read-after-write token', bool(token['X-Read-After-Write']))
+    check('writer reads own booking from the primary',
+          len(client.get('/api/bookings?user_id=1', headers=token).get_json()) == 1)
+    check('other clients read from the replica', other_client.get('/api/bookings?user_id=1').get_json() == [])
+    check('a forged token is ignored', client.get('/api/bookings?user_id=1', headers={
+        'X-Read-After-Write': token['X-Read-After-Write'][:-2] + 'xx'}).get_json() == [])
+
+    app_module.availability_cache.clear()
+    slots = client.get('/api/parking-slots', headers=token).get_json()
+    check('availability right after a booking comes from the primary',
+          len(slots[0]['availability']['tomorrow']) == 2)
+
+    time.sleep(WINDOW + 0.1)
+    check('writer reads move to the replica after the window',
+          client.get('/api/bookings?user_id=1', headers=token).get_json() == [])
+    app_module.availability_cache.clear()
+    slots = client.get('/api/parking-slots', headers=token).get_json()
+    check('availability moves to the replica after the window',
+          len(slots[0]['availability']['tomorrow']) == 1)
+
+    check.exit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Shared helpers for the backend benchmarks.
+
+The benchmarks run against a throwaway SQLite database so they can be
+executed without the MySQL server the application normally talks to.
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Benchmarks run in one process, but the app refuses to start without a key
+BENCHMARK_SECRET_KEY = 'benchmark-secret-key'
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def temp_db_url():
+    fd, db_path = tempfile.mkstemp(suffix='.db', prefix='parking-bench-')
+    os.close(fd)
+    return f'sqlite:///{db_path}'
+
+
+def load_app(config=None):
+    """Create the Flask app on a fresh SQLite file with its tables and default lot.
+
+    Returns (app_module, app) so benchmarks can reach models and services.
+    """
+    import app as app_module
+    # Every benchmark client shares one address, so rate limits are off unless asked for
+    app = app_module.create_app({'SQLALCHEMY_DATABASE_URI': temp_db_url(), 'RATE_LIMIT_ENABLED': False,
+                                 'SECRET_KEY': BENCHMARK_SECRET_KEY, **(config or {})})
+    with app.app_context():
+        app_module.db.create_all()
+        # Seeded slots fall into the default lot unless they name another one
+        app_module.db.session.add(app_module.Lot(id=app_module.DEFAULT_LOT_ID, name='Main lot'))
+        app_module.db.session.commit()
+    return app_module, app
+
+
+class Checks:
+    """Print an ok/FAIL line per assertion; ``exit()`` ends the run non-zero if any failed.
+
+    Call the instance as ``check(label, condition)``.
+    """
+
+    def __init__(self):
+        self.failures = []
+
+    def __call__(self, label, condition):
+        print(f"{'ok  ' if condition else 'FAIL'} {label}")
+        if not condition:
+            self.failures.append(label)
+
+    def exit(self):
+        sys.exit(1 if self.failures else 0)
+
+
+def timed(fn, repeat=5):
+    """Run ``fn`` ``repeat`` times and return (best_seconds, last_result)."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
@@ -0,0 +1,297 @@
+"""Reproducible load test for the booking API.
+
+Seeds a throwaway SQLite database with a configurable number of users,
+slots, bookings and complaints, then drives a weighted mix of signup,
+login, parking-slot listings, booking, cancellation and admin listings
+from several threads. Requests go either through the Flask test client
+or over real HTTP to an in-process threaded server.
+
+Prints one JSON report: p50/p99 latency, throughput and SQL queries per
+request for every operation, plus the totals. With the same seed and
+volumes the request sequence is the same on every run, so two reports
+can be compared directly in review.
+
+Usage: python benchmarks/load_test.py [--driver client|http] [--threads N]
+       [--requests M] [--users U] [--slots S] [--bookings B]
+       [--complaints C] [--seed X] [--output report.json]
+"""
+import argparse
+import http.client
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from werkzeug.serving import make_server
+
+from common import load_app
+
+PASSWORD = 'load-test-password'
+
+# Operation -> (weight, endpoint as recorded by the request metrics)
+MIX = {
+    'parking_slots': (40, 'api.get_parking_slots'),
+    'login': (15, 'api.login'),
+    'book': (15, 'api.book_slot'),
+    'cancel': (8, 'api.cancel_booking'),
+    'user_bookings': (7, 'api.get_bookings'),
+    'signup': (5, 'api.signup'),
+    'admin_bookings': (5, 'api.get_all_bookings'),
+    'admin_complaints': (5, 'api.get_all_complaints'),
+}
+
+
+def seed(app_module, app, args):
+    db = app_module.db
+    rng = random.Random(args.seed)
+    with app.app_context():
+        password = app_module.password_hasher.hash(PASSWORD)
+        db.session.bulk_insert_mappings(app_module.User, [
+            {'name': f'User {n}', 'username': f'user{n}', 'email': f'user{n}@example.com', 'password': password}
+            for n in range(1, args.users + 1)
+        ])
+        db.session.bulk_insert_mappings(app_module.ParkingSlot, [{'name': f'S{n}'} for n in range(1, args.slots + 1)])
+
+        # Past bookings, one hour each, never overlapping within a slot
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        bookings = []
+        for n in range(args.bookings):
+            slot_index, rank = n % args.slots, n // args.slots
+            start = today - timedelta(days=1 + rank // 14) + timedelta(hours=8 + rank % 14)
+            bookings.append({'user_id': rng.randint(1, args.users), 'slot_id': slot_index + 1,
+                             'start_time': start, 'end_time': start + timedelta(hours=1),
+                             'vehicle_type': rng.choice(('car', 'bike'))})
+        db.session.bulk_insert_mappings(app_module.Booking, bookings)
+
+        db.session.bulk_insert_mappings(app_module.Complaint, [{
+            'user_id': rng.randint(1, args.users),
+            'slot_name': f'S{rng.randint(1, args.slots)}',
+            'description': 'Seeded complaint',
+            'status': rng.choice(('Open', 'Resolved')),
+            'created_at': today - timedelta(minutes=rng.randint(1, 60 * 24 * 90)),
+        } for _ in range(args.complaints)])
+        db.session.commit()
+        app_module.create_admin_user()
+
+
+class ClientDriver:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPDriver:
+    def __init__(self, port):
+        self.connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.connection.request(method, path, payload, headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            raise
+        try:
+            return response.status, json.loads(data) if data else None
+        except ValueError:
+            return response.status, None
+
+
+class Worker:
+    """Runs a seeded sequence of operations and records (operation, seconds, status)."""
+
+    def __init__(self, index, driver, args, admin_token):
+        self.index = index
+        self.driver = driver
+        self.args = args
+        self.admin_token = admin_token
+        self.rng = random.Random(args.seed * 1000 + index)
+        self.own_bookings = []
+        self.signups = 0
+        self.samples = []
+
+    def run(self, requests):
+        operations = list(MIX)
+        weights = [MIX[operation][0] for operation in operations]
+        for _ in range(requests):
+            operation = self.rng.choices(operations, weights)[0]
+            if operation == 'cancel' and not self.own_bookings:
+                operation = 'book'
+            started = time.perf_counter()
+            try:
+                status = getattr(self, operation)()
+            except Exception:
+                status = 0
+            self.samples.append((operation, time.perf_counter() - started, status))
+
+    def user_id(self):
+        return self.rng.randint(1, self.args.users)
+
+    def parking_slots(self):
+        return self.driver.request('GET', '/api/parking-slots')[0]
+
+    def login(self):
+        identifier = f'user{self.user_id()}'
+        if self.rng.random() < 0.5:
+            identifier += '@example.com'
+        return self.driver.request('POST', '/api/login', {'identifier': identifier, 'password': PASSWORD})[0]
+
+    def book(self):
+        tomorrow = (datetime.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        start = tomorrow.replace(hour=self.rng.randint(8, 20))
+        status, body = self.driver.request('POST', '/api/book', {
+            'user_id': self.user_id(),
+            'slot_id': self.rng.randint(1, self.args.slots),
+            'start_time': start.isoformat(),
+            'end_time': (start + timedelta(hours=self.rng.randint(1, 2))).isoformat(),
+            'vehicle_type': self.rng.choice(('car', 'bike')),
+        })
+        if status == 201:
+            self.own_bookings.append(body['booking_id'])
+        return status
+
+    def cancel(self):
+        booking_id = self.own_bookings.pop(self.rng.randrange(len(self.own_bookings)))
+        return self.driver.request('POST', '/api/cancel-booking', {'booking_id': booking_id})[0]
+
+    def user_bookings(self):
+        return self.driver.request('GET', f'/api/bookings?user_id={self.user_id()}')[0]
+
+    def signup(self):
+        self.signups += 1
+        name = f'load-{self.args.seed}-{self.index}-{self.signups}'
+        return self.driver.request('POST', '/api/signup', {
+            'name': name, 'username': name, 'email': f'{name}@example.com', 'password': PASSWORD})[0]
+
+    def admin_bookings(self):
+        return self.driver.request('GET', f'/api/admin/bookings?limit=100&user_id={self.user_id()}',
+                                   headers={'Authorization': self.admin_token})[0]
+
+    def admin_complaints(self):
+        return self.driver.request('GET', '/api/admin/complaints?limit=100&status=Open',
+                                   headers={'Authorization': self.admin_token})[0]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))]
+
+
+def summarize(latencies, statuses, elapsed, queries=None):
+    latencies = sorted(latencies)
+    summary = {
+        'requests': len(latencies),
+        'errors': sum(1 for status in statuses if status == 0 or status >= 500),
+        'status_codes': {str(code): statuses.count(code) for code in sorted(set(statuses))},
+        'p50_ms': round(percentile(latencies, 0.50) * 1e3, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1e3, 3) if latencies else None,
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+    if queries is not None:
+        summary['queries_per_request'] = queries
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--driver', choices=('client', 'http'), default='client')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=500, help='requests per thread')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--slots', type=int, default=50)
+    parser.add_argument('--bookings', type=int, default=20000)
+    parser.add_argument('--complaints', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--hash-method', default='pbkdf2:sha256:1000',
+                        help='password hash policy; the production default (scrypt) dominates login and signup')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    args = parser.parse_args()
+
+    app_module, app = load_app({'LOG_LEVEL': 'OFF', 'PASSWORD_HASH_METHOD': args.hash_method})
+    seed(app_module, app, args)
+
+    server = None
+    if args.driver == 'http':
+        # Keep the per-request access log out of the report
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        def make_driver():
+            return HTTPDriver(server.server_port)
+    else:
+        def make_driver():
+            return ClientDriver(app)
+
+    _, body = make_driver().request('POST', '/api/admin/login', {'username': 'admin', 'password': 'admin123'})
+    admin_token = body['token']
+
+    workers = [Worker(index, make_driver(), args, admin_token) for index in range(args.threads)]
+    threads = [threading.Thread(target=worker.run, args=(args.requests,)) for worker in workers]
+    queries_before = app_module.request_metrics.query_totals()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    queries_after = app_module.request_metrics.query_totals()
+    if server:
+        server.shutdown()
+
+    by_operation = defaultdict(lambda: ([], []))
+    for worker in workers:
+        for operation, seconds, status in worker.samples:
+            by_operation[operation][0].append(seconds)
+            by_operation[operation][1].append(status)
+
+    def queries_per_request(endpoints):
+        requests = queries = 0
+        for key, (count, total) in queries_after.items():
+            if key[0] in endpoints:
+                before_count, before_total = queries_before.get(key, (0, 0))
+                requests += count - before_count
+                queries += total - before_total
+        return round(queries / requests, 2) if requests else None
+
+    operations = {
+        operation: summarize(latencies, statuses, elapsed, queries_per_request({MIX[operation][1]}))
+        for operation, (latencies, statuses) in sorted(by_operation.items())
+    }
+    all_latencies = [seconds for latencies, _ in by_operation.values() for seconds in latencies]
+    all_statuses = [status for _, statuses in by_operation.values() for status in statuses]
+    report = {
+        'driver': args.driver,
+        'seed': args.seed,
+        'threads': args.threads,
+        'volumes': {'users': args.users, 'slots': args.slots, 'bookings': args.bookings, 'complaints': args.complaints},
+        'elapsed_seconds': round(elapsed, 3),
+        'total': summarize(all_latencies, all_statuses, elapsed,
+                           queries_per_request({endpoint for _, endpoint in MIX.values()})),
+        'operations': operations,
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    sys.exit(1 if report['total']['errors'] else 0)
+
+
+if __name__ == '__main__':
+    main()
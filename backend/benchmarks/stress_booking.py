@@ -0,0 +1,85 @@
+"""Hammer POST /api/book from many threads and verify no slot is double-booked.
+
+Every worker competes for the same handful of slots with overlapping
+windows, so most requests must be rejected. The run fails if any two
+committed bookings for a slot overlap.
+
+Usage: python benchmarks/stress_booking.py [--threads N] [--requests M] [--slots S]
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from common import load_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=100, help='requests per thread')
+    parser.add_argument('--slots', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    app_module, app = load_app()
+    db = app_module.db
+    with app.app_context():
+        db.session.add(app_module.User(name='Stress', username='stress', email='stress@example.com', password='x'))
+        db.session.bulk_insert_mappings(app_module.ParkingSlot, [{'name': f'S{i}'} for i in range(args.slots)])
+        db.session.commit()
+
+    day = (datetime.now() + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
+    statuses = Counter()
+    statuses_lock = threading.Lock()
+    start_barrier = threading.Barrier(args.threads)
+
+    def worker(index):
+        rng = random.Random(args.seed + index)
+        client = app.test_client()
+        local = Counter()
+        start_barrier.wait()
+        for _ in range(args.requests):
+            start = day + timedelta(minutes=15 * rng.randrange(0, 52))
+            end = start + timedelta(minutes=15 * rng.randint(1, 4))
+            response = client.post('/api/book', json={
+                'user_id': 1,
+                'slot_id': rng.randint(1, args.slots),
+                'start_time': start.isoformat(),
+                'end_time': end.isoformat(),
+                'vehicle_type': 'car',
+            })
+            local[response.status_code] += 1
+        with statuses_lock:
+            statuses.update(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    Booking = app_module.Booking
+    with app.app_context():
+        rows = db.session.query(Booking.slot_id, Booking.start_time, Booking.end_time).order_by(
+            Booking.slot_id, Booking.start_time).all()
+    double_booked = sum(
+        1 for previous, current in zip(rows, rows[1:])
+        if previous.slot_id == current.slot_id and current.start_time < previous.end_time
+    )
+
+    total = args.threads * args.requests
+    print(f"requests={total} threads={args.threads} elapsed={elapsed:.2f}s rate={total / elapsed:.0f} req/s")
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    print(f"bookings committed: {len(rows)} double bookings: {double_booked}")
+    if double_booked or statuses.get(500):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
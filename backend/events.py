@@ -0,0 +1,76 @@
+import json
+import secrets
+import threading
+from collections import deque
+from itertools import islice
+
+
+class EventBroker:
+    """In-process pub/sub for Server-Sent Events.
+
+    Published events go into one shared, numbered ring buffer and a single
+    condition variable wakes every waiting subscriber, so publishing costs the
+    same no matter how many clients are connected and an idle client holds no
+    queue of its own. A subscriber that falls further behind than the buffer
+    receives a ``reset`` event telling it to refetch the full state.
+
+    Event ids are ``<epoch>-<seq>`` with an epoch drawn per broker, so a
+    Last-Event-ID issued by another worker process, or by this one before a
+    restart, is recognised and answered with a ``reset`` too.
+    """
+
+    def __init__(self, history=1000, heartbeat=15):
+        self.heartbeat = heartbeat
+        self.epoch = secrets.token_hex(4)
+        self._events = deque(maxlen=history)
+        self._seq = 0
+        self._condition = threading.Condition()
+        self.subscribers = 0
+
+    def publish(self, event, data):
+        with self._condition:
+            self._seq += 1
+            self._events.append((self._seq, event, json.dumps(data)))
+            self._condition.notify_all()
+
+    def _pending(self, cursor):
+        # Called with the condition held: events newer than cursor, or None if
+        # the cursor has fallen out of the buffer
+        oldest = self._events[0][0] if self._events else self._seq + 1
+        if cursor + 1 < oldest:
+            return None
+        return list(islice(self._events, cursor + 1 - oldest, None))
+
+    def _resume_after(self, last_event_id):
+        # Called with the condition held: the seq a Last-Event-ID resumes after.
+        # Ids from another broker resume from before the buffer, which sends a reset
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return -1
+        return int(seq)
+
+    def stream(self, last_event_id=None):
+        """Yield SSE-formatted messages, starting after ``last_event_id`` if given."""
+        with self._condition:
+            cursor = self._seq if last_event_id is None else self._resume_after(last_event_id)
+            self.subscribers += 1
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                with self._condition:
+                    if self._seq == cursor:
+                        self._condition.wait(self.heartbeat)
+                    if self._seq == cursor:
+                        events = []
+                    else:
+                        events = self._pending(cursor)
+                        if events is None:
+                            events = [(self._seq, 'reset', '{}')]
+                        cursor = self._seq
+                if not events:
+                    yield ': keepalive\n\n'
+                    continue
+                yield ''.join(f'id: {self.epoch}-{seq}\nevent: {event}\ndata: {data}\n\n' for seq, event, data in events)
+        finally:
+            with self._condition:
+                self.subscribers -= 1
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+import sqlalchemy as sa
+from flask import current_app, g, jsonify, request
+
+# Responses that ask the client to try again are not replayed
+RETRYABLE_STATUSES = {409, 429}
+
+
+class DatabaseKeyStore:
+    """Idempotency keys in a table with a unique (endpoint, key) constraint, shared by every worker.
+
+    The first request inserts its key without a response; duplicates that
+    find it in flight poll until the response is saved. The claim is a
+    lease, so a key left behind by a worker that died mid-request can be
+    taken over once it expires. Any object with the same methods can
+    replace it.
+    """
+
+    def __init__(self, db, model, poll_interval=0.05):
+        self.db = db
+        self.model = model
+        self.poll_interval = poll_interval
+
+    def _row(self, key):
+        endpoint, idempotency_key = key
+        return self.model.query.filter_by(endpoint=endpoint, idempotency_key=idempotency_key)
+
+    def claim(self, key, fingerprint, lease):
+        """Return (stored response or None, whether this request now owns the key)."""
+        session = self.db.session
+        now = datetime.utcnow()
+        try:
+            row = self._row(key).first()
+            if row is not None and row.expires_at <= now:
+                # An expired response, or the lease of a request that never finished
+                self._row(key).filter(self.model.expires_at <= now).delete(synchronize_session=False)
+                row = None
+            if row is None:
+                endpoint, idempotency_key = key
+                session.add(self.model(endpoint=endpoint, idempotency_key=idempotency_key, fingerprint=fingerprint,
+                                       expires_at=now + timedelta(seconds=lease)))
+                session.commit()
+                return None, True
+            stored = None if row.status is None else (
+                row.fingerprint, row.status, row.body, row.content_type, json.loads(row.headers))
+            # End the read so the next poll, and the view, see fresh data
+            session.rollback()
+            return stored, False
+        except sa.exc.IntegrityError:
+            # Another request claimed the key first
+            session.rollback()
+            return None, False
+
+    def wait(self, key, timeout):
+        time.sleep(min(self.poll_interval, timeout))
+
+    def save(self, key, stored, ttl):
+        fingerprint, status, body, content_type, headers = stored
+        session = self.db.session
+        session.rollback()
+        self._row(key).update({
+            self.model.status: status,
+            self.model.body: body,
+            self.model.content_type: content_type,
+            self.model.headers: json.dumps(headers),
+            self.model.expires_at: datetime.utcnow() + timedelta(seconds=ttl),
+        }, synchronize_session=False)
+        session.commit()
+
+    def release(self, key):
+        session = self.db.session
+        session.rollback()
+        self._row(key).filter(self.model.status.is_(None)).delete(synchronize_session=False)
+        session.commit()
+
+
+class IdempotencyKeys:
+    """Replay the first response to requests repeating an ``Idempotency-Key`` header.
+
+    The first request with a key runs; duplicates arriving while it is in
+    flight wait for it, and later ones get its stored response until the key
+    expires. Keys are scoped per endpoint and bound to the request body, so
+    reusing one for a different request is rejected. Server errors and
+    retryable statuses are not stored, letting the next attempt run again.
+    Responses are saved after the ``after_request`` hooks of extensions
+    initialised later, so ``replay_headers`` such as the read-after-write
+    token set by one of them are replayed too.
+    """
+
+    def __init__(self, store=None, ttl=86400, wait=10, lease=60, replay_headers=()):
+        self.store = store
+        self.ttl = ttl
+        self.wait = wait
+        self.lease = lease
+        self.replay_headers = tuple(replay_headers)
+        self.replayed = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app, store=None):
+        self.store = store or self.store
+        self.ttl = app.config['IDEMPOTENCY_KEY_TTL']
+        # after_request hooks run in reverse order of registration
+        app.after_request(self._save)
+        app.teardown_request(self._release)
+
+    def _save(self, response):
+        claim = g.get('idempotency_claim')
+        if claim is None:
+            return response
+        key, fingerprint = claim
+        if response.status_code < 500 and response.status_code not in RETRYABLE_STATUSES:
+            self.store.save(key, (
+                fingerprint,
+                response.status_code,
+                response.get_data(),
+                response.content_type,
+                {name: response.headers[name] for name in self.replay_headers if name in response.headers},
+            ), self.ttl)
+        else:
+            self.store.release(key)
+        g.pop('idempotency_claim')
+        return response
+
+    def _release(self, exc):
+        # The view raised, or saving failed: free the key for the next attempt
+        claim = g.pop('idempotency_claim', None)
+        if claim is not None:
+            self.store.release(claim[0])
+
+    def _replay(self, stored, fingerprint):
+        stored_fingerprint, status, body, content_type, headers = stored
+        if stored_fingerprint != fingerprint:
+            return jsonify({'message': 'Idempotency-Key was already used for a different request'}), 422
+        with self._lock:
+            self.replayed += 1
+        response = current_app.response_class(body, status=status, content_type=content_type)
+        response.headers.update(headers)
+        response.headers['Idempotent-Replayed'] = 'true'
+        return response
+
+    def idempotent(self, name):
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                header = request.headers.get('Idempotency-Key')
+                if not header:
+                    return f(*args, **kwargs)
+                if len(header) > 255:
+                    return jsonify({'message': 'Idempotency-Key must be at most 255 characters'}), 400
+                key = (name, header)
+                fingerprint = hashlib.blake2b(request.get_data(), digest_size=16).hexdigest()
+                deadline = time.monotonic() + self.wait
+                while True:
+                    stored, owned = self.store.claim(key, fingerprint, self.lease)
+                    if owned:
+                        break
+                    if stored:
+                        return self._replay(stored, fingerprint)
+                    # Another request with this key is running; its outcome decides ours
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return jsonify({'message': 'A request with this Idempotency-Key is still in progress'}), 409
+                    self.store.wait(key, remaining)
+                g.idempotency_claim = (key, fingerprint)
+                return f(*args, **kwargs)
+            return decorated_function
+        return decorator
@@ -0,0 +1,119 @@
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger('parking.mail')
+
+
+class MailDispatcher:
+    """Background sender for outbound mail.
+
+    Messages are queued by request handlers and delivered by a small pool of
+    worker threads. Each worker drains up to ``batch_size`` queued messages and
+    sends them over a single SMTP connection, retrying a failed batch with
+    exponential backoff.
+    """
+
+    def __init__(self, mail, app=None, queue_size=1000, workers=2, batch_size=20,
+                 max_retries=3, backoff=1.0):
+        self.app = app
+        self.mail = mail
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0,
+            'dropped': 0,
+            'sent': 0,
+            'failed': 0,
+            'retries': 0,
+            'send_latency_seconds_total': 0.0,
+            'send_latency_seconds_max': 0.0,
+        }
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config.get('MAIL_WORKERS', self.workers)
+        self._queue = queue.Queue(maxsize=app.config.get('MAIL_QUEUE_SIZE', self._queue.maxsize))
+
+    def send(self, msg):
+        """Queue a message for delivery; returns False if the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((msg, time.perf_counter()))
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('enqueued')
+        return True
+
+    def join(self):
+        """Block until every queued message has been sent or given up on."""
+        self._queue.join()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        return stats
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'mail-dispatcher-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _deliver(self, batch):
+        pending = list(batch)
+        attempt = 0
+        while pending:
+            try:
+                with self.app.app_context(), self.mail.connect() as connection:
+                    while pending:
+                        msg, queued_at = pending[0]
+                        connection.send(msg)
+                        pending.pop(0)
+                        self._record_sent(time.perf_counter() - queued_at)
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    logger.error('mail_batch_failed', extra={'emails': len(pending), 'error': str(e)})
+                    self._count('failed', len(pending))
+                    return
+                self._count('retries')
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+    def _record_sent(self, latency):
+        with self._stats_lock:
+            self._stats['sent'] += 1
+            self._stats['send_latency_seconds_total'] += latency
+            self._stats['send_latency_seconds_max'] = max(self._stats['send_latency_seconds_max'], latency)
@@ -0,0 +1,32 @@
+"""Booking conflict index and parking slot version
+
+Revision ID: 5c1e7a9b3d42
+Revises: 0979d02df196
+Create Date: 2026-10-18 09:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7a9b3d42'
+down_revision = '0979d02df196'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('parking_slot', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.create_index('ix_booking_slot_id_start_time_end_time', ['slot_id', 'start_time', 'end_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_slot_id_start_time_end_time')
+
+    with op.batch_alter_table('parking_slot', schema=None) as batch_op:
+        batch_op.drop_column('version')
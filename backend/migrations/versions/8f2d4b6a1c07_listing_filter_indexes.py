@@ -0,0 +1,38 @@
+"""Indexes for paginated booking and complaint listings
+
+Revision ID: 8f2d4b6a1c07
+Revises: 5c1e7a9b3d42
+Create Date: 2026-10-18 10:03:47.215530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2d4b6a1c07'
+down_revision = '5c1e7a9b3d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.create_index('ix_booking_user_id', ['user_id'], unique=False)
+        batch_op.create_index('ix_booking_start_time', ['start_time'], unique=False)
+
+    with op.batch_alter_table('complaint', schema=None) as batch_op:
+        batch_op.create_index('ix_complaint_user_id', ['user_id'], unique=False)
+        batch_op.create_index('ix_complaint_status', ['status'], unique=False)
+        batch_op.create_index('ix_complaint_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('complaint', schema=None) as batch_op:
+        batch_op.drop_index('ix_complaint_created_at')
+        batch_op.drop_index('ix_complaint_status')
+        batch_op.drop_index('ix_complaint_user_id')
+
+    with op.batch_alter_table('booking', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_start_time')
+        batch_op.drop_index('ix_booking_user_id')
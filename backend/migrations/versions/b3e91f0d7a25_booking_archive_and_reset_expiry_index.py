@@ -0,0 +1,48 @@
+"""Booking archive table and password reset expiry index
+
+Revision ID: b3e91f0d7a25
+Revises: 8f2d4b6a1c07
+Create Date: 2026-10-18 14:21:09.604418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e91f0d7a25'
+down_revision = '8f2d4b6a1c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('booking_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('slot_id', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column('vehicle_type', sa.String(length=20), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['slot_id'], ['parking_slot.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('booking_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_booking_archive_user_id', ['user_id'], unique=False)
+        batch_op.create_index('ix_booking_archive_start_time', ['start_time'], unique=False)
+
+    with op.batch_alter_table('password_reset', schema=None) as batch_op:
+        batch_op.create_index('ix_password_reset_expires_at', ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('password_reset', schema=None) as batch_op:
+        batch_op.drop_index('ix_password_reset_expires_at')
+
+    with op.batch_alter_table('booking_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_booking_archive_start_time')
+        batch_op.drop_index('ix_booking_archive_user_id')
+
+    op.drop_table('booking_archive')
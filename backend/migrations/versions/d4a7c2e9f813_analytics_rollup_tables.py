@@ -0,0 +1,49 @@
+"""Analytics rollup tables
+
+Revision ID: d4a7c2e9f813
+Revises: b3e91f0d7a25
+Create Date: 2026-10-18 16:02:31.118274
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7c2e9f813'
+down_revision = 'b3e91f0d7a25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('slot_day_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('slot_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('booked_seconds', sa.Integer(), nullable=False),
+        sa.Column('bookings', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['slot_id'], ['parking_slot.id'], ),
+        sa.PrimaryKeyConstraint('day', 'slot_id')
+    )
+    op.create_table('hourly_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('hour', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('vehicle_type', sa.String(length=20), nullable=False),
+        sa.Column('weekday', sa.Integer(), nullable=False),
+        sa.Column('booked_seconds', sa.Integer(), nullable=False),
+        sa.Column('bookings', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'hour', 'vehicle_type')
+    )
+    op.create_table('complaint_rollup',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('slot_name', sa.String(length=50), nullable=False),
+        sa.Column('complaints', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'slot_name')
+    )
+    # Existing history is loaded afterwards with `flask --app app rebuild-analytics`
+
+
+def downgrade():
+    op.drop_table('complaint_rollup')
+    op.drop_table('hourly_rollup')
+    op.drop_table('slot_day_rollup')
@@ -0,0 +1,42 @@
+"""Parking lots with their own hours and booking horizon
+
+Revision ID: e6b1f3a8d52c
+Revises: d4a7c2e9f813
+Create Date: 2026-10-18 18:24:07.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b1f3a8d52c'
+down_revision = 'd4a7c2e9f813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    lot = op.create_table('lot',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('opening_hour', sa.Integer(), nullable=False),
+        sa.Column('closing_hour', sa.Integer(), nullable=False),
+        sa.Column('booking_horizon_days', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Existing slots move into a lot with the previous fixed rules: 8:00 to 22:00, today or tomorrow
+    op.bulk_insert(lot, [{'id': 1, 'name': 'Main lot', 'opening_hour': 8, 'closing_hour': 22, 'booking_horizon_days': 1}])
+    with op.batch_alter_table('parking_slot', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lot_id', sa.Integer(), server_default='1', nullable=False))
+        batch_op.create_index('ix_parking_slot_lot_id', ['lot_id'], unique=False)
+        batch_op.create_foreign_key('fk_parking_slot_lot_id', 'lot', ['lot_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('parking_slot', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_parking_slot_lot_id', type_='foreignkey')
+        batch_op.drop_index('ix_parking_slot_lot_id')
+        batch_op.drop_column('lot_id')
+
+    op.drop_table('lot')
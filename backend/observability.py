@@ -0,0 +1,179 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Standard LogRecord attributes; anything else on a record came in through ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+# Per-request SQL statement counter, None outside a request
+_query_counter = contextvars.ContextVar('query_counter', default=None)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, event and any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(app):
+    """Route the ``parking`` loggers to stderr at LOG_LEVEL; LOG_LEVEL=OFF silences them."""
+    logger = logging.getLogger('parking')
+    level = app.config['LOG_LEVEL'].upper()
+    # Above CRITICAL, so every parking.* call is dropped at the level check
+    logger.setLevel(logging.CRITICAL + 1 if level == 'OFF' else level)
+    logger.propagate = False
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        if app.config['LOG_FORMAT'] == 'json':
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One count per bucket plus +Inf, not cumulative until rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(labels):
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+class RequestMetrics:
+    """Per-endpoint latency and SQL query count histograms in Prometheus text format.
+
+    Every statement sent through any SQLAlchemy engine is counted against the
+    current request; a request running more than ``query_warning_threshold``
+    statements is logged as a warning, which is how N+1 query loops show up.
+    Other services add gauges and counters with ``add_collector``.
+    """
+
+    def __init__(self, query_warning_threshold=25):
+        self.query_warning_threshold = query_warning_threshold
+        self.logger = logging.getLogger('parking.metrics')
+        self._lock = threading.Lock()
+        self._latency = {}
+        self._queries = {}
+        self._responses = defaultdict(int)
+        self._query_warnings = defaultdict(int)
+        self._collectors = []
+        self._listening = False
+
+    def init_app(self, app):
+        self.query_warning_threshold = app.config['QUERY_COUNT_WARNING_THRESHOLD']
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        if not self._listening:
+            # Listening on the Engine class covers the primary and every bind
+            event.listen(Engine, 'before_cursor_execute', self._count_query)
+            self._listening = True
+
+    def add_collector(self, collect):
+        """``collect()`` returns (name, type, help, [(labels, value), ...]) tuples."""
+        self._collectors.append(collect)
+
+    def _count_query(self, conn, cursor, statement, parameters, context, executemany):
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+    def _start_request(self):
+        g.metrics_started = time.perf_counter()
+        g.query_counter = [0]
+        _query_counter.set(g.query_counter)
+
+    def _finish_request(self, response):
+        _query_counter.set(None)
+        if 'metrics_started' not in g:
+            return response
+        duration = time.perf_counter() - g.metrics_started
+        queries = g.query_counter[0]
+        endpoint = request.endpoint or 'unmatched'
+        key = (endpoint, request.method)
+        with self._lock:
+            self._latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self._queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(queries)
+            self._responses[key + (response.status_code,)] += 1
+            if queries > self.query_warning_threshold:
+                self._query_warnings[key] += 1
+        if queries > self.query_warning_threshold:
+            self.logger.warning('too_many_queries', extra={
+                'endpoint': endpoint, 'method': request.method, 'queries': queries,
+                'threshold': self.query_warning_threshold})
+        return response
+
+    def query_totals(self):
+        """Return {(endpoint, method): (requests, queries)} recorded so far."""
+        with self._lock:
+            return {key: (histogram.count, histogram.sum) for key, histogram in self._queries.items()}
+
+    def _render_histograms(self, lines, name, help_text, histograms):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (endpoint, method), histogram in sorted(histograms.items()):
+            labels = {'endpoint': endpoint, 'method': method}
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels({**labels, "le": bound})} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+            lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+
+    def render(self):
+        lines = []
+        with self._lock:
+            self._render_histograms(lines, 'http_request_duration_seconds',
+                                    'Time spent handling a request.', self._latency)
+            self._render_histograms(lines, 'db_queries_per_request',
+                                    'SQL statements executed while handling a request.', self._queries)
+            lines.append('# HELP http_responses_total Responses sent, by status code.')
+            lines.append('# TYPE http_responses_total counter')
+            for (endpoint, method, status), count in sorted(self._responses.items()):
+                lines.append(f'http_responses_total{_labels({"endpoint": endpoint, "method": method, "status": status})} {count}')
+            lines.append(f'# HELP db_query_count_warnings_total Requests that ran more than {self.query_warning_threshold} SQL statements.')
+            lines.append('# TYPE db_query_count_warnings_total counter')
+            for (endpoint, method), count in sorted(self._query_warnings.items()):
+                lines.append(f'db_query_count_warnings_total{_labels({"endpoint": endpoint, "method": method})} {count}')
+
+        for collect in self._collectors:
+            for name, metric_type, help_text, samples in collect():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_labels(labels) if labels else ""} {value}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a bounded worker pool under a configurable policy.
+
+    ``method`` is any werkzeug method string ("scrypt", "pbkdf2:sha256", ...);
+    ``iterations`` overrides the pbkdf2 iteration count. At most ``workers``
+    hashes run at once and at most ``max_pending`` may wait, beyond which
+    HasherBusy is raised instead of queueing more work. The calling request
+    thread waits for its hash, so ``workers + max_pending`` is how many
+    request threads hashing can occupy; keep it below the server's.
+    """
+
+    def __init__(self, method='scrypt', iterations=None, workers=4, max_pending=4):
+        self._executor = None
+        self.configure(method, iterations, workers, max_pending)
+
+    def init_app(self, app):
+        self.configure(app.config['PASSWORD_HASH_METHOD'],
+                       iterations=app.config['PASSWORD_HASH_ITERATIONS'],
+                       workers=app.config['PASSWORD_HASH_WORKERS'],
+                       max_pending=app.config['PASSWORD_HASH_MAX_PENDING'])
+
+    def configure(self, method, iterations=None, workers=4, max_pending=4):
+        if iterations and method.startswith('pbkdf2'):
+            if method.count(':') < 1:
+                method = f'{method}:sha256'
+            method = f'{method}:{iterations}'
+        self.method = method
+        previous = self._executor
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hasher')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._policy_prefix = None
+        if previous is not None:
+            # Hashes already submitted finish; its threads exit once they are done
+            previous.shutdown(wait=False)
+
+    def _run(self, fn, *args):
+        # Release the semaphore that was acquired, even if configure() replaced it meanwhile
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HasherBusy('Too many password hashes in flight')
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        return self._run(check_password_hash, stored_hash, password)
+
+    @property
+    def policy_prefix(self):
+        # Werkzeug fills in defaults (hash name, iterations, scrypt cost), so read
+        # the canonical parameters back from a throwaway hash once
+        if self._policy_prefix is None:
+            self._policy_prefix = generate_password_hash('', method=self.method).split('$', 1)[0]
+        return self._policy_prefix
+
+    def needs_rehash(self, stored_hash):
+        return stored_hash.split('$', 1)[0] != self.policy_prefix
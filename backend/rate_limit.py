@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+
+from flask import jsonify, request
+
+
+class MemoryBucketStore:
+    """Token buckets kept in this process, least recently used dropped past ``maxsize``.
+
+    Any object with the same ``take`` method can replace it, e.g. one backed
+    by a shared cache so every worker enforces one budget per client.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        """Spend one token; returns (allowed, seconds until a token is available)."""
+        rate = capacity / period
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+
+class RateLimiter:
+    """Per-client token-bucket limits for named endpoints.
+
+    ``limits`` maps a name to (capacity, period_seconds): a client may burst
+    ``capacity`` requests and then gets ``capacity`` more per ``period``.
+    Names without a limit are not throttled.
+    """
+
+    def __init__(self, store=None, limits=None):
+        self.store = store or MemoryBucketStore()
+        self.limits = dict(limits or {})
+        self.enabled = True
+        self._rejected = defaultdict(int)
+        self._rejected_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config['RATE_LIMIT_ENABLED']
+        self.limits = dict(app.config['RATE_LIMITS'])
+
+    def rejected(self):
+        with self._rejected_lock:
+            return dict(self._rejected)
+
+    def check(self, name):
+        """Spend one of the client's tokens for ``name``; returns a 429 response once they run out, else None."""
+        limit = self.limits.get(name)
+        if not (self.enabled and limit):
+            return None
+        # remote_addr is the proxy's address unless TRUSTED_PROXIES applies ProxyFix
+        allowed, retry_after = self.store.take((name, request.remote_addr), *limit)
+        if allowed:
+            return None
+        with self._rejected_lock:
+            self._rejected[name] += 1
+        response = jsonify({'message': 'Too many requests, please try again shortly'})
+        response.headers['Retry-After'] = str(max(1, round(retry_after)))
+        return response, 429
+
+    def limit(self, name):
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                return self.check(name) or f(*args, **kwargs)
+            return decorated_function
+        return decorator
@@ -0,0 +1,63 @@
+import time
+
+import sqlalchemy as sa
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, Signer
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to the replica bind when the request opted in.
+
+    Requests opt in by setting ``g.read_from_replica``. Flushes, UPDATE/DELETE
+    statements and everything outside such requests stay on the primary, as
+    does every read when no replica bind is configured.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_app_context() and g.get('read_from_replica')
+                and (clause is None or isinstance(clause, sa.Select))):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadAfterWrite:
+    """Keep a client's reads on the primary for ``window`` seconds after it writes.
+
+    Requests that wrote hand the client a signed expiry time in the
+    ``X-Read-After-Write`` response header, which the client sends back on
+    later requests. The window travels with the client, so it holds whichever
+    worker serves the next request.
+    """
+
+    header = 'X-Read-After-Write'
+
+    def __init__(self, window=5):
+        self.window = window
+        self._signer = None
+
+    def init_app(self, app):
+        self.window = app.config['REPLICA_READ_AFTER_WRITE_SECONDS']
+        self._signer = Signer(app.config['SECRET_KEY'], salt='read-after-write')
+        app.after_request(self._issue)
+
+    def record_write(self):
+        g.wrote_to_primary = True
+
+    def recently_wrote(self):
+        token = request.headers.get(self.header)
+        if not token:
+            return False
+        try:
+            return float(self._signer.unsign(token)) > time.time()
+        except (BadSignature, ValueError):
+            return False
+
+    def _issue(self, response):
+        if g.get('wrote_to_primary'):
+            response.headers[self.header] = self._signer.sign(repr(time.time() + self.window)).decode()
+        return response
@@ -0,0 +1,155 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+
+def _offset(day_start, moment):
+    return int((moment - day_start).total_seconds())
+
+
+class _Day:
+    """Booked intervals per slot plus every free gap of the day ordered by length."""
+
+    def __init__(self, opening, closing):
+        self.opening = opening
+        self.closing = closing
+        # slot_id -> (sorted booking starts, matching ends), in seconds from midnight
+        self.slots = {}
+        # (length, gap_start, gap_end, slot_id), kept sorted
+        self.gaps = []
+        self.lengths = []
+
+    def _gap_bounds(self, starts, ends, i):
+        # The free gap between booking i - 1 and booking i
+        return (ends[i - 1] if i else self.opening), (starts[i] if i < len(starts) else self.closing)
+
+    def _add_gap(self, slot_id, start, end):
+        if end > start:
+            gap = (end - start, start, end, slot_id)
+            i = bisect_left(self.gaps, gap)
+            self.gaps.insert(i, gap)
+            self.lengths.insert(i, gap[0])
+
+    def _remove_gap(self, slot_id, start, end):
+        if end > start:
+            i = bisect_left(self.gaps, (end - start, start, end, slot_id))
+            if i < len(self.gaps) and self.gaps[i] == (end - start, start, end, slot_id):
+                del self.gaps[i]
+                del self.lengths[i]
+
+    def add_slot(self, slot_id, starts=(), ends=()):
+        self.slots[slot_id] = (list(starts), list(ends))
+        starts, ends = self.slots[slot_id]
+        for i in range(len(starts) + 1):
+            self._add_gap(slot_id, *self._gap_bounds(starts, ends, i))
+
+    def book(self, slot_id, start, end):
+        if slot_id not in self.slots:
+            self.add_slot(slot_id)
+        starts, ends = self.slots[slot_id]
+        i = bisect_right(starts, start)
+        self._remove_gap(slot_id, *self._gap_bounds(starts, ends, i))
+        starts.insert(i, start)
+        ends.insert(i, end)
+        self._add_gap(slot_id, *self._gap_bounds(starts, ends, i))
+        self._add_gap(slot_id, *self._gap_bounds(starts, ends, i + 1))
+
+    def release(self, slot_id, start, end):
+        starts, ends = self.slots.get(slot_id, ((), ()))
+        for i in range(bisect_right(starts, start) - 1, -1, -1):
+            if starts[i] != start:
+                return
+            if ends[i] == end:
+                self._remove_gap(slot_id, *self._gap_bounds(starts, ends, i))
+                self._remove_gap(slot_id, *self._gap_bounds(starts, ends, i + 1))
+                del starts[i]
+                del ends[i]
+                self._add_gap(slot_id, *self._gap_bounds(starts, ends, i))
+                return
+
+    def best_fit(self, start, end, limit):
+        found = []
+        gaps = self.gaps
+        # Gaps shorter than the request cannot hold it; scan the rest shortest first
+        for i in range(bisect_left(self.lengths, end - start), len(gaps)):
+            _, gap_start, gap_end, slot_id = gaps[i]
+            if gap_start <= start and end <= gap_end:
+                found.append(slot_id)
+                if len(found) == limit:
+                    break
+        return found
+
+
+class SlotIntervalIndex:
+    """In-memory index of booked intervals and free gaps for every parking slot, per lot and day.
+
+    Days are loaded lazily through a loader callable and kept in sync by
+    ``add``/``remove`` on booking writes. The index is only a hint: the booking
+    transaction still re-checks the database.
+    """
+
+    def __init__(self):
+        self._days = {}
+        self._lock = threading.Lock()
+
+    def _load(self, lot_id, day, loader):
+        """``loader(lot_id, day)`` returns (opening_hour, closing_hour, slot_ids, [(slot_id, start_time, end_time), ...])."""
+        opening_hour, closing_hour, slot_ids, rows = loader(lot_id, day)
+        day_start = datetime.combine(day, datetime.min.time())
+        bookings = {slot_id: ([], []) for slot_id in slot_ids}
+        for slot_id, start, end in sorted(rows, key=lambda row: (row[0], row[1])):
+            if slot_id in bookings:
+                bookings[slot_id][0].append(_offset(day_start, start))
+                bookings[slot_id][1].append(_offset(day_start, end))
+        index = _Day(opening_hour * 60 * 60, closing_hour * 60 * 60)
+        for slot_id, (starts, ends) in bookings.items():
+            index.add_slot(slot_id, starts, ends)
+        return index
+
+    def _day(self, lot_id, day, loader):
+        with self._lock:
+            index = self._days.get((lot_id, day))
+        if index is None:
+            index = self._load(lot_id, day, loader)
+            with self._lock:
+                index = self._days.setdefault((lot_id, day), index)
+        return index
+
+    def best_fit(self, lot_id, start_time, end_time, loader, limit=5):
+        """Return up to ``limit`` slot ids of the lot free for the window, tightest fit first.
+
+        A slot's fit is the length of the free gap that would hold the booking;
+        filling the shortest gap that fits keeps long gaps intact for long
+        bookings. Ties go to the earlier gap, then the lower slot id.
+        """
+        day = start_time.date()
+        day_start = datetime.combine(day, datetime.min.time())
+        index = self._day(lot_id, day, loader)
+        with self._lock:
+            return index.best_fit(_offset(day_start, start_time), _offset(day_start, end_time), limit)
+
+    def add(self, lot_id, slot_id, start_time, end_time):
+        day = start_time.date()
+        day_start = datetime.combine(day, datetime.min.time())
+        with self._lock:
+            index = self._days.get((lot_id, day))
+            if index is not None:
+                index.book(slot_id, _offset(day_start, start_time), _offset(day_start, end_time))
+
+    def remove(self, lot_id, slot_id, start_time, end_time):
+        day = start_time.date()
+        day_start = datetime.combine(day, datetime.min.time())
+        with self._lock:
+            index = self._days.get((lot_id, day))
+            if index is not None:
+                index.release(slot_id, _offset(day_start, start_time), _offset(day_start, end_time))
+
+    def forget(self, lot_id, day):
+        """Drop a lot's day so it is reloaded from the database on next use."""
+        with self._lock:
+            self._days.pop((lot_id, day), None)
+
+    def roll_over(self, today):
+        with self._lock:
+            for key in [key for key in self._days if key[1] < today]:
+                del self._days[key]
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { api } from './services/api';
+import { api, Analytics } from './services/api';
 import { Button } from "./components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "./components/ui/card";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "./components/ui/tabs";
@@ -28,26 +28,41 @@ interface Complaint {
 export default function AdminDashboard() {
     const [bookings, setBookings] = useState<Booking[]>([]);
     const [complaints, setComplaints] = useState<Complaint[]>([]);
+    const [bookingsCursor, setBookingsCursor] = useState<string | null>(null);
+    const [complaintsCursor, setComplaintsCursor] = useState<string | null>(null);
+    const [analytics, setAnalytics] = useState<Analytics | null>(null);
     const navigate = useNavigate();
 
     useEffect(() => {
         fetchBookings();
         fetchComplaints();
+        fetchAnalytics();
     }, []);
 
-    const fetchBookings = async () => {
+    const fetchAnalytics = async () => {
         try {
-            const response = await api.getAllBookings();
-            setBookings(response.data);
+            const response = await api.getAnalytics();
+            setAnalytics(response.data);
+        } catch (error) {
+            console.error('Failed to fetch analytics', error);
+        }
+    };
+
+    const fetchBookings = async (cursor?: string) => {
+        try {
+            const response = await api.getAllBookings({ cursor });
+            setBookings((previous) => cursor ? [...previous, ...response.data.items] : response.data.items);
+            setBookingsCursor(response.data.next_cursor);
         } catch (error) {
             console.error('Failed to fetch bookings', error);
         }
     };
 
-    const fetchComplaints = async () => {
+    const fetchComplaints = async (cursor?: string) => {
         try {
-            const response = await api.getAllComplaints();
-            setComplaints(response.data);
+            const response = await api.getAllComplaints({ cursor });
+            setComplaints((previous) => cursor ? [...previous, ...response.data.items] : response.data.items);
+            setComplaintsCursor(response.data.next_cursor);
         } catch (error) {
             console.error('Failed to fetch complaints', error);
         }
@@ -77,9 +92,10 @@ export default function AdminDashboard() {
 
             <main className="container mx-auto p-4 mt-8">
                 <Tabs defaultValue="bookings" className="space-y-4">
-                    <TabsList className="grid w-full grid-cols-2 gap-4">
+                    <TabsList className="grid w-full grid-cols-3 gap-4">
                         <TabsTrigger value="bookings" className="bg-white text-primary hover:bg-primary hover:text-white transition-colors duration-300">Bookings</TabsTrigger>
                         <TabsTrigger value="complaints" className="bg-white text-primary hover:bg-primary hover:text-white transition-colors duration-300">Complaints</TabsTrigger>
+                        <TabsTrigger value="analytics" className="bg-white text-primary hover:bg-primary hover:text-white transition-colors duration-300">Analytics</TabsTrigger>
                     </TabsList>
 
                     <TabsContent value="bookings">
@@ -108,6 +124,11 @@ export default function AdminDashboard() {
                                         </Card>
                                     ))}
                                 </div>
+                                {bookingsCursor && (
+                                    <Button onClick={() => fetchBookings(bookingsCursor)} variant="outline" className="mt-4 w-full">
+                                        Load more
+                                    </Button>
+                                )}
                             </CardContent>
                         </Card>
                     </TabsContent>
@@ -144,9 +165,67 @@ export default function AdminDashboard() {
                                         </Card>
                                     ))}
                                 </div>
+                                {complaintsCursor && (
+                                    <Button onClick={() => fetchComplaints(complaintsCursor)} variant="outline" className="mt-4 w-full">
+                                        Load more
+                                    </Button>
+                                )}
                             </CardContent>
                         </Card>
                     </TabsContent>
+
+                    <TabsContent value="analytics">
+                        <Card className="bg-white shadow-lg rounded-lg overflow-hidden">
+                            <CardHeader className="bg-gray-200 p-4">
+                                <CardTitle className="text-2xl font-bold text-primary">
+                                    Occupancy {analytics && `(${analytics.from} - ${analytics.to})`}
+                                </CardTitle>
+                            </CardHeader>
+                            {analytics && (
+                                <CardContent className="p-6 space-y-6">
+                                    <p className="text-sm text-gray-600">
+                                        Peak hours: {analytics.peak_hours.map((hour) => `${hour}:00`).join(', ')}
+                                    </p>
+                                    <table className="text-xs">
+                                        <thead>
+                                            <tr>
+                                                <th></th>
+                                                {analytics.hours.map((hour) => <th key={hour} className="px-1">{hour}</th>)}
+                                            </tr>
+                                        </thead>
+                                        <tbody>
+                                            {analytics.heatmap.map((row, weekday) => (
+                                                <tr key={weekday}>
+                                                    <td className="pr-2">{['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'][weekday]}</td>
+                                                    {row.map((occupancy, index) => (
+                                                        <td key={index} className="w-6 h-6" title={`${Math.round(occupancy * 100)}%`}
+                                                            style={{ backgroundColor: `rgba(37, 99, 235, ${occupancy})` }} />
+                                                    ))}
+                                                </tr>
+                                            ))}
+                                        </tbody>
+                                    </table>
+                                    <div className="space-y-1">
+                                        {analytics.slots.map((slot) => (
+                                            <p key={slot.slot_id} className="text-sm text-gray-600">
+                                                {slot.slot_name}: {Math.round(slot.occupancy * 100)}% occupied, {slot.bookings} bookings
+                                            </p>
+                                        ))}
+                                    </div>
+                                    <p className="text-sm text-gray-600">
+                                        Vehicles: {analytics.vehicle_types.map((row) => `${row.vehicle_type} ${Math.round(row.share * 100)}%`).join(', ')}
+                                    </p>
+                                    <div className="space-y-1">
+                                        {analytics.complaints.map((row) => (
+                                            <p key={row.slot_name} className="text-sm text-gray-600">
+                                                {row.slot_name}: {row.complaints} complaints
+                                            </p>
+                                        ))}
+                                    </div>
+                                </CardContent>
+                            )}
+                        </Card>
+                    </TabsContent>
                 </Tabs>
             </main>
         </div>
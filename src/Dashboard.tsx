@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { api } from './services/api';
 import { Button } from "./components/ui/button";
@@ -44,12 +44,42 @@ export default function Dashboard() {
     const [complaint, setComplaint] = useState('');
     const [complaintSlot, setComplaintSlot] = useState('');
     const navigate = useNavigate();
+    // One Idempotency-Key per write the user is making: retrying the same request after a
+    // failure reuses it, so a write that reached the server before the failure is not repeated
+    const pendingKeys = useRef(new Map<string, string>());
+
+    const idempotencyKey = (request: string) => {
+        let key = pendingKeys.current.get(request);
+        if (!key) {
+            key = crypto.randomUUID();
+            pendingKeys.current.set(request, key);
+        }
+        return key;
+    };
+
+    // A response ends the action unless it may not have been applied (no response, 5xx, 409, 429)
+    const settleRequest = (request: string, error?: unknown) => {
+        const status = axios.isAxiosError(error) ? error.response?.status : undefined;
+        if (!error || (status !== undefined && status < 500 && status !== 409 && status !== 429)) {
+            pendingKeys.current.delete(request);
+        }
+    };
 
     useEffect(() => {
         fetchParkingSlots();
         fetchBookings();
     }, []);
 
+    useEffect(() => {
+        // Apply pushed changes instead of re-fetching every slot
+        const source = api.subscribeToAvailability((delta) => {
+            setParkingSlots((slots) => slots.map((slot) => slot.id === delta.slot_id && delta.day in slot.availability
+                ? { ...slot, availability: { ...slot.availability, [delta.day]: delta.availability } }
+                : slot));
+        }, fetchParkingSlots);
+        return () => source.close();
+    }, []);
+
     const fetchParkingSlots = async () => {
         try {
             const response = await api.getParkingSlots();
@@ -89,20 +119,24 @@ export default function Dashboard() {
             return;
         }
 
+        const booking = {
+            slot_id: selectedSlot.id,
+            vehicle_type: vehicleType,
+            start_time: startTime,
+            end_time: endTime,
+            user_id: parseInt(userId, 10),
+        };
+        const request = `book:${JSON.stringify(booking)}`;
         try {
-            const response = await api.bookSlot({
-                slot_id: selectedSlot.id,
-                vehicle_type: vehicleType,
-                start_time: startTime,
-                end_time: endTime,
-                user_id: parseInt(userId, 10),
-            });
+            const response = await api.bookSlot(booking, idempotencyKey(request));
+            settleRequest(request);
             console.log('Booking response:', response);
             alert('Booking successful!');
             fetchParkingSlots();  // Refresh parking slots
             fetchBookings();      // Refresh bookings
             setSelectedSlot(null);
         } catch (error) {
+            settleRequest(request, error);
             console.error('Booking failed', error);
             if (axios.isAxiosError(error) && error.response) {
                 alert(`Booking failed: ${error.response.data.message}`);
@@ -113,12 +147,15 @@ export default function Dashboard() {
     };
 
     const handleCancel = async (bookingId: number) => {
+        const request = `cancel:${bookingId}`;
         try {
-            await api.cancelBooking(bookingId);
+            await api.cancelBooking(bookingId, idempotencyKey(request));
+            settleRequest(request);
             alert('Booking cancelled successfully!');
             fetchBookings();
             fetchParkingSlots();
         } catch (error) {
+            settleRequest(request, error);
             console.error('Cancellation failed', error);
             alert('Cancellation failed. Please try again.');
         }
@@ -136,16 +173,20 @@ export default function Dashboard() {
             alert('Please select a slot for your complaint.');
             return;
         }
+        const complaintData = {
+            user_id: parseInt(userId, 10),
+            slot_name: complaintSlot,
+            description: complaint
+        };
+        const request = `complaint:${JSON.stringify(complaintData)}`;
         try {
-            await api.raiseComplaint({
-                user_id: parseInt(userId, 10),
-                slot_name: complaintSlot,
-                description: complaint
-            });
+            await api.raiseComplaint(complaintData, idempotencyKey(request));
+            settleRequest(request);
             alert('Complaint submitted successfully!');
             setComplaint('');
             setComplaintSlot('');
         } catch (error) {
+            settleRequest(request, error);
             console.error('Failed to submit complaint', error);
             alert('Failed to submit complaint. Please try again.');
         }
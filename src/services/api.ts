@@ -2,12 +2,23 @@ import axios from 'axios';
 
 const API_URL = 'http://localhost:5000/api';
 
+export interface Lot {
+    id: number;
+    name: string;
+    opening_hour: number;
+    closing_hour: number;
+    booking_horizon_days: number;
+}
+
 export interface ParkingSlot {
     id: number;
     name: string;
+    lot_id: number;
+    // 'today' and 'tomorrow' by default, ISO dates when a date range is requested
     availability: {
         today: AvailabilitySlot[];
         tomorrow: AvailabilitySlot[];
+        [day: string]: AvailabilitySlot[];
     };
 }
 
@@ -17,6 +28,14 @@ export interface AvailabilitySlot {
     bikes_available?: number;
 }
 
+export interface AvailabilityDelta {
+    lot_id: number;
+    slot_id: number;
+    day: string;
+    date: string;
+    availability: AvailabilitySlot[];
+}
+
 export interface Booking {
     id: number;
     slot_id: number;
@@ -26,6 +45,34 @@ export interface Booking {
     vehicle_type: 'car' | 'bike';
 }
 
+export interface Page<T> {
+    items: T[];
+    next_cursor: string | null;
+}
+
+export interface ListingParams {
+    limit?: number;
+    cursor?: string;
+    user_id?: number;
+    slot_id?: number;
+    slot_name?: string;
+    status?: string;
+    from?: string;
+    to?: string;
+}
+
+export interface Analytics {
+    from: string;
+    to: string;
+    slots: { slot_id: number; slot_name: string; bookings: number; booked_hours: number; occupancy: number }[];
+    hours: number[];
+    hourly_occupancy: number[];
+    peak_hours: number[];
+    heatmap: number[][];
+    vehicle_types: { vehicle_type: string; bookings: number; booked_hours: number; share: number }[];
+    complaints: { slot_name: string; complaints: number }[];
+}
+
 export interface LoginResponse {
     message: string;
     user_id: number;
@@ -46,6 +93,27 @@ adminAxios.interceptors.request.use((config) => {
     return config;
 });
 
+// Writes return a short-lived token; sending it back keeps our reads on the primary database
+// so they include our own writes, whichever server handles them
+axios.interceptors.response.use((response) => {
+    const token = response.headers['x-read-after-write'];
+    if (token) {
+        sessionStorage.setItem('readAfterWrite', token);
+    }
+    return response;
+});
+
+axios.interceptors.request.use((config) => {
+    const token = sessionStorage.getItem('readAfterWrite');
+    if (token) {
+        config.headers['X-Read-After-Write'] = token;
+    }
+    return config;
+});
+
+// Requests repeating a key are applied once, so callers keep one key per user action and reuse it on retries
+const idempotent = (key?: string) => (key ? { headers: { 'Idempotency-Key': key } } : {});
+
 export const api = {
     signup: (userData: { name: string; username: string; email: string; password: string }) =>
         axios.post(`${API_URL}/signup`, userData),
@@ -59,34 +127,51 @@ export const api = {
     resetPassword: (token: string, newPassword: string) =>
         axios.post(`${API_URL}/reset-password`, { token, new_password: newPassword }),
 
-    getParkingSlots: () =>
-        axios.get<ParkingSlot[]>(`${API_URL}/parking-slots`),
+    getLots: () =>
+        axios.get<Lot[]>(`${API_URL}/lots`),
+
+    getParkingSlots: (params?: { lot_id?: number; from?: string; to?: string }) =>
+        axios.get<ParkingSlot[]>(`${API_URL}/parking-slots`, { params }),
+
+    // Live availability deltas; the browser reconnects and resumes on its own
+    subscribeToAvailability: (onDelta: (delta: AvailabilityDelta) => void, onReset: () => void) => {
+        const source = new EventSource(`${API_URL}/parking-slots/stream`);
+        source.addEventListener('availability', (event) => onDelta(JSON.parse((event as MessageEvent).data)));
+        source.addEventListener('reset', onReset);
+        return source;
+    },
 
     getBookings: (userId: number) =>
         axios.get<Booking[]>(`${API_URL}/bookings`, { params: { user_id: userId } }),
 
-    bookSlot: (bookingData: { slot_id: number; vehicle_type: 'car' | 'bike'; start_time: string; end_time: string; user_id: number }) =>
-        axios.post<Booking>(`${API_URL}/book`, bookingData),
+    bookSlot: (bookingData: { slot_id: number | 'any'; vehicle_type: 'car' | 'bike'; start_time: string; end_time: string; user_id: number }, idempotencyKey?: string) =>
+        axios.post<Booking>(`${API_URL}/book`, bookingData, idempotent(idempotencyKey)),
+
+    bookSlotsBulk: (bulkData: { user_id: number; mode?: 'all_or_nothing' | 'best_effort'; items: { slot_id: number; vehicle_type: 'car' | 'bike'; start_time: string; end_time: string }[] }) =>
+        axios.post(`${API_URL}/book/bulk`, bulkData),
 
-    cancelBooking: (bookingId: number) =>
-        axios.post(`${API_URL}/cancel-booking`, { booking_id: bookingId }),
+    cancelBooking: (bookingId: number, idempotencyKey?: string) =>
+        axios.post(`${API_URL}/cancel-booking`, { booking_id: bookingId }, idempotent(idempotencyKey)),
 
-    raiseComplaint: (complaintData: { user_id: number, slot_name: string, description: string }) =>
-        axios.post(`${API_URL}/complaint`, complaintData),
+    raiseComplaint: (complaintData: { user_id: number, slot_name: string, description: string }, idempotencyKey?: string) =>
+        axios.post(`${API_URL}/complaint`, complaintData, idempotent(idempotencyKey)),
 
     // Add a new function to get all complaints (for future admin panel use)
-    getComplaints: () =>
-        axios.get(`${API_URL}/complaints`),
+    getComplaints: (params?: ListingParams) =>
+        axios.get<Page<Complaint>>(`${API_URL}/complaints`, { params }),
 
     // Add these new functions
     adminLogin: (credentials: { username: string; password: string }) =>
         axios.post(`${API_URL}/admin/login`, credentials),
 
-    getAllBookings: () =>
-        adminAxios.get<AdminBooking[]>(`/admin/bookings`),
+    getAllBookings: (params?: ListingParams) =>
+        adminAxios.get<Page<AdminBooking>>(`/admin/bookings`, { params }),
+
+    getAllComplaints: (params?: ListingParams) =>
+        adminAxios.get<Page<Complaint>>(`/admin/complaints`, { params }),
 
-    getAllComplaints: () =>
-        adminAxios.get<Complaint[]>(`/admin/complaints`),
+    getAnalytics: (params?: { from?: string; to?: string }) =>
+        adminAxios.get<Analytics>(`/admin/analytics`, { params }),
 
     adminLogout: () =>
         adminAxios.post('/admin/logout'),